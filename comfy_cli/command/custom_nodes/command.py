@@ -796,7 +796,7 @@ def display_all_nodes():
     try:
         nodes = registry_api.list_all_nodes()
     except Exception as e:
-        logging.error(f"Failed to fetch nodes from the registry: {str(e)}")
+        logging.error("Failed to fetch nodes from the registry: %s", e)
         ui.display_error_message("Failed to fetch nodes from the registry.")
 
     # Map Node data class instances to tuples for display
@@ -865,7 +865,7 @@ def registry_install(
             return
 
     except Exception as e:
-        logging.error(f"Encountered an error while installing the node. error: {str(e)}")
+        logging.error("Encountered an error while installing the node. error: %s", e)
         ui.display_error_message(f"Failed to download the custom node {node_id}.")
         return
 
@@ -886,21 +886,21 @@ def registry_install(
     node_specific_path.mkdir(parents=True, exist_ok=True)  # Create the directory if it doesn't exist
 
     local_filename = node_specific_path / f"{node_id}-{node_version.version}.zip"
-    logging.debug(f"Start downloading the node {node_id} version {node_version.version} to {local_filename}")
+    logging.debug("Start downloading the node %s version %s to %s", node_id, node_version.version, local_filename)
     download_file(node_version.download_url, local_filename)
 
     # Extract the downloaded archive to the custom_node directory on the workspace.
-    logging.debug(f"Start extracting the node {node_id} version {node_version.version} to {custom_nodes_path}")
+    logging.debug("Start extracting the node %s version %s to %s", node_id, node_version.version, custom_nodes_path)
     extract_package_as_zip(local_filename, node_specific_path)
 
     # TODO: temoporary solution to run requirement.txt and install script
     execute_install_script(node_specific_path)
 
     # Delete the downloaded archive
-    logging.debug(f"Deleting the downloaded archive {local_filename}")
+    logging.debug("Deleting the downloaded archive %s", local_filename)
     os.remove(local_filename)
 
-    logging.info(f"Node {node_id} version {node_version.version} has been successfully installed.")
+    logging.info("Node %s version %s has been successfully installed.", node_id, node_version.version)
 
 
 @app.command(
@@ -1,5 +1,6 @@
 import configparser
 import os
+import tempfile
 from importlib.metadata import version
 from typing import Optional, Tuple
 
@@ -16,19 +17,31 @@ class ConfigManager(object):
 
     @staticmethod
     def get_config_path():
-        return constants.DEFAULT_CONFIG[get_os()]
+        return constants.default_config(get_os())
 
     def get_config_file_path(self):
         return os.path.join(self.get_config_path(), "config.ini")
 
     def write_config(self):
-        config_file_path = os.path.join(self.get_config_path(), "config.ini")
+        config_file_path = self.get_config_file_path()
         dir_path = os.path.dirname(config_file_path)
         if not os.path.exists(dir_path):
             os.mkdir(dir_path)
 
-        with open(config_file_path, "w") as configfile:
-            self.config.write(configfile)
+        # Write to a uniquely named temp file next to config.ini and atomically swap it
+        # into place, so neither concurrent readers nor another comfy process writing at
+        # the same time can leave or observe a partially written config.ini
+        fd, tmp_file_path = tempfile.mkstemp(dir=dir_path, prefix="config.ini.", suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w") as configfile:
+                self.config.write(configfile)
+            os.replace(tmp_file_path, config_file_path)
+        except BaseException:
+            try:
+                os.unlink(tmp_file_path)
+            except OSError:
+                pass
+            raise
 
     def set(self, key, value):
         """
@@ -45,14 +58,17 @@ class ConfigManager(object):
 
     def load(self):
         config_file_path = self.get_config_file_path()
-        if os.path.exists(config_file_path):
-            self.config = configparser.ConfigParser()
-            self.config.read(config_file_path)
+        try:
+            with open(config_file_path) as config_file:
+                config = configparser.ConfigParser()
+                config.read_file(config_file)
+            self.config = config
+        except FileNotFoundError:
+            pass
 
         # TODO: We need a policy for clearing the tmp directory.
         tmp_path = os.path.join(self.get_config_path(), "tmp")
-        if not os.path.exists(tmp_path):
-            os.makedirs(tmp_path)
+        os.makedirs(tmp_path, exist_ok=True)
 
         if "background" in self.config["DEFAULT"]:
             bg_info = self.config["DEFAULT"]["background"].strip("()").split(",")
@@ -65,14 +81,14 @@ class ConfigManager(object):
     def fill_print_env(self, table):
         table.add_row("Config Path", self.get_config_file_path())
 
+        section = self.config["DEFAULT"]
+
         launch_extras = ""
-        if self.config.has_option("DEFAULT", "default_workspace"):
-            table.add_row(
-                "Default ComfyUI workspace",
-                self.config["DEFAULT"][constants.CONFIG_KEY_DEFAULT_WORKSPACE],
-            )
+        default_workspace = section.get(constants.CONFIG_KEY_DEFAULT_WORKSPACE)
+        if default_workspace is not None:
+            table.add_row("Default ComfyUI workspace", default_workspace)
 
-            launch_extras = self.config["DEFAULT"].get(constants.CONFIG_KEY_DEFAULT_LAUNCH_EXTRAS, "")
+            launch_extras = section.get(constants.CONFIG_KEY_DEFAULT_LAUNCH_EXTRAS, "")
         else:
             table.add_row("Default ComfyUI workspace", "No default ComfyUI workspace")
 
@@ -81,21 +97,20 @@ class ConfigManager(object):
 
         table.add_row("Default ComfyUI launch extra options", launch_extras)
 
-        if self.config.has_option("DEFAULT", constants.CONFIG_KEY_RECENT_WORKSPACE):
-            table.add_row(
-                "Recent ComfyUI workspace",
-                self.config["DEFAULT"][constants.CONFIG_KEY_RECENT_WORKSPACE],
-            )
+        recent_workspace = section.get(constants.CONFIG_KEY_RECENT_WORKSPACE)
+        if recent_workspace is not None:
+            table.add_row("Recent ComfyUI workspace", recent_workspace)
         else:
             table.add_row("Recent ComfyUI workspace", "No recent run")
 
-        if self.config.has_option("DEFAULT", "enable_tracking"):
+        enable_tracking = section.get(constants.CONFIG_KEY_ENABLE_TRACKING)
+        if enable_tracking is not None:
             table.add_row(
                 "Tracking Analytics",
-                ("Enabled" if self.config["DEFAULT"]["enable_tracking"] == "True" else "Disabled"),
+                ("Enabled" if enable_tracking == "True" else "Disabled"),
             )
 
-        if self.config.has_option("DEFAULT", constants.CONFIG_KEY_BACKGROUND):
+        if section.get(constants.CONFIG_KEY_BACKGROUND) is not None:
             bg_info = self.background
             if bg_info:
                 table.add_row(
@@ -116,6 +131,6 @@ class ConfigManager(object):
         try:
             return version("comfy-cli")
         except Exception as e:
-            logging.debug(f"Error occurred while retrieving CLI version using importlib.metadata: {e}")
+            logging.debug("Error occurred while retrieving CLI version using importlib.metadata: %s", e)
 
         return "0.0.0"
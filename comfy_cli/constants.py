@@ -1,3 +1,4 @@
+import functools
 import os
 from enum import Enum
 
@@ -17,17 +18,29 @@ COMFY_GITHUB_URL = "https://github.com/comfyanonymous/ComfyUI"
 COMFY_MANAGER_GITHUB_URL = "https://github.com/ltdrdata/ComfyUI-Manager"
 
 DEFAULT_COMFY_MODEL_PATH = "models"
-DEFAULT_COMFY_WORKSPACE = {
-    OS.WINDOWS: os.path.join(os.path.expanduser("~"), "Documents", "comfy", "ComfyUI"),
-    OS.MACOS: os.path.join(os.path.expanduser("~"), "Documents", "comfy", "ComfyUI"),
-    OS.LINUX: os.path.join(os.path.expanduser("~"), "comfy", "ComfyUI"),
-}
-
-DEFAULT_CONFIG = {
-    OS.WINDOWS: os.path.join(os.path.expanduser("~"), "AppData", "Local", "comfy-cli"),
-    OS.MACOS: os.path.join(os.path.expanduser("~"), "Library", "Application Support", "comfy-cli"),
-    OS.LINUX: os.path.join(os.path.expanduser("~"), ".config", "comfy-cli"),
-}
+
+
+@functools.lru_cache(maxsize=None)
+def _home() -> str:
+    return os.path.expanduser("~")
+
+
+# Default paths are resolved on first use, and only for the OS being asked about
+@functools.lru_cache(maxsize=None)
+def default_comfy_workspace(os_kind: OS) -> str:
+    if os_kind == OS.LINUX:
+        return os.path.join(_home(), "comfy", "ComfyUI")
+    return os.path.join(_home(), "Documents", "comfy", "ComfyUI")
+
+
+@functools.lru_cache(maxsize=None)
+def default_config(os_kind: OS) -> str:
+    if os_kind == OS.WINDOWS:
+        return os.path.join(_home(), "AppData", "Local", "comfy-cli")
+    if os_kind == OS.MACOS:
+        return os.path.join(_home(), "Library", "Application Support", "comfy-cli")
+    return os.path.join(_home(), ".config", "comfy-cli")
+
 
 CONTEXT_KEY_WORKSPACE = "workspace"
 CONTEXT_KEY_RECENT = "recent"
@@ -49,14 +62,16 @@ DEFAULT_TRACKING_VALUE = True
 COMFY_LOCK_YAML_FILE = "comfy.lock.yaml"
 
 # TODO: figure out a better way to check if this is a comfy repo
-COMFY_ORIGIN_URL_CHOICES = [
-    "git@github.com:comfyanonymous/ComfyUI.git",
-    "git@github.com:drip-art/comfy.git",
-    "https://github.com/comfyanonymous/ComfyUI.git",
-    "https://github.com/drip-art/ComfyUI.git",
-    "https://github.com/comfyanonymous/ComfyUI",
-    "https://github.com/drip-art/ComfyUI",
-]
+COMFY_ORIGIN_URL_CHOICES = frozenset(
+    {
+        "git@github.com:comfyanonymous/ComfyUI.git",
+        "git@github.com:drip-art/comfy.git",
+        "https://github.com/comfyanonymous/ComfyUI.git",
+        "https://github.com/drip-art/ComfyUI.git",
+        "https://github.com/comfyanonymous/ComfyUI",
+        "https://github.com/drip-art/ComfyUI",
+    }
+)
 
 
 class CUDAVersion(str, Enum):
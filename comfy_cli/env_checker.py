@@ -2,8 +2,10 @@
 Module for checking various env and state conditions.
 """
 
+import functools
 import os
 import sys
+import time
 
 import requests
 from rich.console import Console
@@ -14,7 +16,16 @@ from comfy_cli.utils import singleton
 
 console = Console()
 
+# Reuse one connection pool for server probes, and remember recent probe results
+# for a short while so repeated checks within one command don't re-query.
+_server_probe_session = requests.Session()
+_server_probe_cache = {}
+_SERVER_PROBE_TTL = 2.0
+# (connect, read) timeouts, so a filtered port can't hang the CLI
+_SERVER_PROBE_TIMEOUT = (0.5, 5)
 
+
+@functools.lru_cache(maxsize=None)
 def format_python_version(version_info):
     """
     Formats the Python version string to display the major and minor version numbers.
@@ -37,14 +48,36 @@ def check_comfy_server_running(port=8188, host="localhost"):
     """
     Checks if the Comfy server is running by making a GET request to the /history endpoint.
 
+    Results are cached per host/port for a couple of seconds.
+
     Returns:
         bool: True if the Comfy server is running, False otherwise.
     """
+    key = (host, port)
+    now = time.monotonic()
+    cached = _server_probe_cache.get(key)
+    if cached is not None and now - cached[0] < _SERVER_PROBE_TTL:
+        return cached[1]
+
     try:
-        response = requests.get(f"http://{host}:{port}/history")
-        return response.status_code == 200
+        with _server_probe_session.get(
+            f"http://{host}:{port}/history", timeout=_SERVER_PROBE_TIMEOUT, stream=True
+        ) as response:
+            running = response.status_code == 200
     except requests.exceptions.RequestException:
-        return False
+        running = False
+
+    _server_probe_cache[key] = (now, running)
+    return running
+
+
+@functools.lru_cache(maxsize=None)
+def _interpreter_rows():
+    """Environment table rows describing the running interpreter, which can't change."""
+    return (
+        ("Python Version", format_python_version(sys.version_info)),
+        ("Python Executable", sys.executable),
+    )
 
 
 @singleton
@@ -85,20 +118,36 @@ class EnvChecker(object):
 
         return None
 
+    @functools.cached_property
+    def comfy_repo(self):
+        """The ComfyUI git repo containing the current directory, or None.
+
+        The git probe is only run the first time this is accessed.
+        """
+        from comfy_cli.workspace_manager import check_comfy_repo
+
+        _, repo = check_comfy_repo(os.getcwd())
+        return repo
+
+    @property
+    def currently_in_comfy_repo(self):
+        return self.comfy_repo is not None
+
     def check(self):
-        self.virtualenv_path = os.environ.get("VIRTUAL_ENV") if os.environ.get("VIRTUAL_ENV") else None
-        self.conda_env = os.environ.get("CONDA_DEFAULT_ENV") if os.environ.get("CONDA_DEFAULT_ENV") else None
+        # drop any cached repo probe so it is redone on next access
+        self.__dict__.pop("comfy_repo", None)
+
+        env = os.environ
+        self.virtualenv_path = env.get("VIRTUAL_ENV") or None
+        self.conda_env = env.get("CONDA_DEFAULT_ENV") or None
 
     # TODO: use ui.display_table
     def fill_print_table(self):
         table = Table(":laptop_computer: Environment", "Value")
-        table.add_row("Python Version", format_python_version(sys.version_info))
-        table.add_row("Python Executable", sys.executable)
-        table.add_row(
-            "Virtualenv Path",
-            self.virtualenv_path if self.virtualenv_path else "Not Used",
-        )
-        table.add_row("Conda Env", self.conda_env if self.conda_env else "Not Used")
+        for row in _interpreter_rows():
+            table.add_row(*row)
+        table.add_row("Virtualenv Path", self.virtualenv_path or "Not Used")
+        table.add_row("Conda Env", self.conda_env or "Not Used")
 
         ConfigManager().fill_print_env(table)
 
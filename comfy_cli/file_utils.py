@@ -1,40 +1,112 @@
+import collections
+import concurrent.futures
+import functools
 import json
 import os
 import pathlib
+import shutil
+import subprocess
+import threading
 import zipfile
-from typing import Optional
+import zlib
+from typing import Optional, Union
 
 import httpx
 import requests
+from requests.adapters import HTTPAdapter
+from rich.progress import Progress
 
 from comfy_cli import ui
+from comfy_cli.utils import iter_files
+
+try:
+    # libdeflate bindings; roughly twice as fast as zlib at the same level
+    import deflate
+except ImportError:
+    deflate = None
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Size of the chunks streamed to disk when downloading. Model files are commonly
+# several GB, so large chunks keep per-chunk Python overhead (progress updates,
+# write calls) low.
+DOWNLOAD_CHUNK_SIZE = 1 << 20
+
+# Files at least this big are fetched as DOWNLOAD_CONNECTIONS parallel Range requests
+# when the server supports it, since hosts like civitai throttle per connection.
+DOWNLOAD_CONNECTIONS = 4
+_RANGED_DOWNLOAD_MIN_SIZE = 64 << 20
+
+# File types that are already compressed; deflating them again only burns CPU.
+_INCOMPRESSIBLE_EXTENSIONS = frozenset(
+    {
+        ".safetensors",
+        ".ckpt",
+        ".pt",
+        ".pth",
+        ".bin",
+        ".png",
+        ".jpg",
+        ".jpeg",
+        ".webp",
+        ".zip",
+        ".gz",
+        ".whl",
+    }
+)
+
+# Files up to this size are read and deflated on worker threads (zlib releases
+# the GIL); larger ones are streamed into the archive on the main thread.
+_PARALLEL_DEFLATE_MAX_FILE_SIZE = 8 << 20
+_ZIP_WORKERS = min(8, os.cpu_count() or 1)
+# The first this-many bytes are deflated inline; tiny archives never start the pool.
+_PARALLEL_ZIP_MIN_SIZE = 16 << 20
+
+# Shared session so repeated requests to the same host reuse pooled (TLS) connections
+_session = requests.Session()
+_session.mount("https://", HTTPAdapter(pool_maxsize=16))
+_session.mount("http://", HTTPAdapter(pool_maxsize=16))
+
+
+@functools.lru_cache(maxsize=None)
+def _get_http_client() -> httpx.Client:
+    """
+    Client shared by downloads, so the probe request and the ranged part requests after
+    it reuse keep-alive connections instead of each doing its own TCP and TLS handshake.
+
+    Built on first use: creating the client sets up an SSL context, which every CLI
+    start would otherwise pay for.
+    """
+    return httpx.Client(limits=httpx.Limits(max_connections=16, max_keepalive_connections=DOWNLOAD_CONNECTIONS))
 
 
 class DownloadException(Exception):
     pass
 
 
-def guess_status_code_reason(status_code: int, message: str) -> str:
-    if status_code == 401:
+class _RangeNotSupported(Exception):
+    pass
 
-        def parse_json(input_data):
-            try:
-                # Check if the input is a byte string
-                if isinstance(input_data, bytes):
-                    # Decode the byte string to a regular string
-                    input_data = input_data.decode("utf-8")
 
-                # Parse the string as JSON
-                json_object = json.loads(input_data)
+_json_loads = orjson.loads if orjson is not None else json.loads
+
 
-                return json_object
+def _parse_json_safely(data):
+    """Parse a JSON str or bytes payload, returning None if it isn't valid JSON."""
+    try:
+        return _json_loads(data)
+    # JSONDecodeError (from either parser) and UnicodeDecodeError are ValueErrors
+    except (ValueError, TypeError):
+        return None
 
-            except json.JSONDecodeError as e:
-                # Handle JSON decoding error
-                print(f"JSON decoding error: {e}")
 
-        msg_json = parse_json(message)
-        if msg_json is not None:
+def guess_status_code_reason(status_code: int, message: Union[str, bytes]) -> str:
+    if status_code == 401:
+        msg_json = _parse_json_safely(message) if message else None
+        if isinstance(msg_json, dict):
             if "message" in msg_json:
                 return f"Unauthorized download ({status_code}).\n{msg_json['message']}\nor you can set civitai api token using `comfy model download --set-civitai-api-token <token>`"
         return f"Unauthorized download ({status_code}), you might need to manually log into browser to download one"
@@ -47,86 +119,365 @@ def guess_status_code_reason(status_code: int, message: str) -> str:
 
 def check_unauthorized(url: str, headers: Optional[dict] = None) -> bool:
     """
-    Perform a GET request to the given URL and check if the response status code is 401 (Unauthorized).
+    Perform a HEAD request to the given URL and check if the response status code is 401 (Unauthorized).
+
+    Servers that reject HEAD with 405 are probed with a streamed GET instead, whose body is never read.
 
     Args:
-        url (str): The URL to send the GET request to.
+        url (str): The URL to send the request to.
         headers (Optional[dict]): Optional headers to include in the request.
 
     Returns:
         bool: True if the response status code is 401, False otherwise.
     """
     try:
-        response = requests.get(url, headers=headers, allow_redirects=True)
+        response = _session.head(url, headers=headers, allow_redirects=True, timeout=10)
+        if response.status_code == 405:
+            with _session.get(url, headers=headers, allow_redirects=True, stream=True, timeout=10) as response:
+                pass
         return response.status_code == 401
     except requests.RequestException:
         # If there's an error making the request, we can't determine if it's unauthorized
         return False
 
 
-def download_file(url: str, local_filepath: pathlib.Path, headers: Optional[dict] = None):
-    """Helper function to download a file."""
+def download_file(
+    url: str,
+    local_filepath: pathlib.Path,
+    headers: Optional[dict] = None,
+    connections: int = DOWNLOAD_CONNECTIONS,
+):
+    """
+    Helper function to download a file.
+
+    Large files are split across `connections` parallel Range requests if the server
+    advertises byte range support; otherwise the response is streamed serially.
+    """
     local_filepath.parent.mkdir(parents=True, exist_ok=True)  # Ensure the directory exists
 
-    with httpx.stream("GET", url, follow_redirects=True, headers=headers) as response:
-        if response.status_code == 200:
-            total = int(response.headers["Content-Length"])
+    probe_headers = headers
+    if connections > 1:
+        # Ranges index the encoded body; ask for it unencoded so Content-Length and the
+        # part sizes are in the bytes that end up on disk
+        probe_headers = {**(headers or {}), "Accept-Encoding": "identity"}
+
+    with _get_http_client().stream("GET", url, follow_redirects=True, headers=probe_headers) as response:
+        if response.status_code != 200:
+            status_reason = guess_status_code_reason(response.status_code, response.read())
+            raise DownloadException(f"Failed to download file.\n{status_reason}")
+
+        total = int(response.headers["Content-Length"])
+        _check_free_space(local_filepath, total)
+        ranged = (
+            connections > 1
+            and total >= _RANGED_DOWNLOAD_MIN_SIZE
+            and response.headers.get("Accept-Ranges") == "bytes"
+            and "Content-Encoding" not in response.headers
+        )
+        if not ranged:
             try:
-                with open(local_filepath, "wb") as f:
+                with open(local_filepath, "wb", buffering=DOWNLOAD_CHUNK_SIZE) as f:
                     for data in ui.show_progress(
-                        response.iter_bytes(),
+                        response.iter_bytes(chunk_size=DOWNLOAD_CHUNK_SIZE),
                         total,
                         description=f"Downloading {total // 1024 // 1024} MB",
                     ):
                         f.write(data)
             except KeyboardInterrupt:
-                delete_eh = ui.prompt_confirm_action("Download interrupted, cleanup files?", True)
-                if delete_eh:
-                    local_filepath.unlink()
+                _cleanup_interrupted_download(local_filepath)
+            return
+
+    # The probe response is closed unread; the ranged requests re-fetch the body
+    try:
+        _download_ranges(url, local_filepath, headers, total, connections)
+    except KeyboardInterrupt:
+        _cleanup_interrupted_download(local_filepath)
+    # The file is sized to `total` up front, so one left behind with a part missing
+    # would look like a complete download
+    except _RangeNotSupported:
+        local_filepath.unlink(missing_ok=True)
+        download_file(url, local_filepath, headers, connections=1)
+    except Exception:
+        local_filepath.unlink(missing_ok=True)
+        raise
+
+
+def _check_free_space(local_filepath: pathlib.Path, size: int):
+    """
+    Fail before a download starts if its target disk can't hold size more bytes.
+
+    Best effort: if the free space can't be determined the download just goes ahead.
+    Nothing is allocated here; posix_fallocate would, but on filesystems without native
+    support (NFSv3, older ZFS) glibc emulates it by writing every block, which stalls a
+    multi-GB download before its first byte.
+    """
+    try:
+        free = shutil.disk_usage(local_filepath.parent).free
+    except OSError:
+        return
+    try:
+        # an existing file at the target path is overwritten, so its space comes back
+        free += local_filepath.stat().st_size
+    except OSError:
+        pass
+    if free < size:
+        raise DownloadException(f"Not enough disk space to download {size // 1024 // 1024} MB")
+
+
+def _cleanup_interrupted_download(local_filepath: pathlib.Path):
+    delete_eh = ui.prompt_confirm_action("Download interrupted, cleanup files?", True)
+    if delete_eh:
+        local_filepath.unlink()
+
+
+def _download_ranges(url: str, local_filepath: pathlib.Path, headers: Optional[dict], total: int, connections: int):
+    """
+    Download `total` bytes of url into local_filepath as `connections` byte ranges fetched
+    in parallel, each written at its own offset.
+
+    Raises _RangeNotSupported if the server answers a Range request with 200, 403, 416
+    or 429, and DownloadException for any other status but 206.
+    """
+    part_size = -(-total // connections)
+    byte_ranges = [(start, min(start + part_size, total) - 1) for start in range(0, total, part_size)]
+    cancelled = threading.Event()
+
+    # Size the file up front so every part can seek to its offset. Extending by truncate
+    # leaves the file sparse, so this doesn't write anything.
+    with open(local_filepath, "wb") as f:
+        f.truncate(total)
+
+    with Progress() as progress:
+        task = progress.add_task(f"Downloading {total // 1024 // 1024} MB", total=total)
+
+        def fetch(byte_range):
+            start, end = byte_range
+            range_headers = {**(headers or {}), "Range": f"bytes={start}-{end}", "Accept-Encoding": "identity"}
+            with _get_http_client().stream("GET", url, follow_redirects=True, headers=range_headers) as response:
+                # 403 and 429 here usually mean the host limits ranged or concurrent
+                # requests, since the probe for the whole file succeeded
+                if response.status_code in (200, 403, 416, 429):
+                    raise _RangeNotSupported(url)
+                if response.status_code != 206:
+                    status_reason = guess_status_code_reason(response.status_code, response.read())
+                    raise DownloadException(f"Failed to download file.\n{status_reason}")
+
+                written = 0
+                with open(local_filepath, "r+b") as f:
+                    f.seek(start)
+                    for data in response.iter_bytes(chunk_size=DOWNLOAD_CHUNK_SIZE):
+                        if cancelled.is_set():
+                            return
+                        f.write(data)
+                        written += len(data)
+                        progress.update(task, advance=len(data))
+
+            if written != end - start + 1:
+                raise DownloadException(f"Failed to download file.\nIncomplete response for bytes {start}-{end}")
+
+        with concurrent.futures.ThreadPoolExecutor(max_workers=len(byte_ranges)) as executor:
+            futures = [executor.submit(fetch, byte_range) for byte_range in byte_ranges]
+            try:
+                for future in futures:
+                    future.result()
+            except BaseException:
+                # Stop the other parts promptly instead of letting them run to completion
+                cancelled.set()
+                raise
+
+
+def _zip_compress_type(file_path: str) -> int:
+    if os.path.splitext(file_path)[1].lower() in _INCOMPRESSIBLE_EXTENSIONS:
+        return zipfile.ZIP_STORED
+    return zipfile.ZIP_DEFLATED
+
+
+def _raw_deflate(data: bytes) -> bytes:
+    """Compress data to a raw deflate stream (no zlib header), as stored in zip entries."""
+    if deflate is not None:
+        return deflate.deflate_compress(data, 6)
+    compressor = zlib.compressobj(zlib.Z_DEFAULT_COMPRESSION, zlib.DEFLATED, -15)
+    return compressor.compress(data) + compressor.flush()
+
+
+def _deflate_zip_entry(entry):
+    """
+    Build the ZipInfo for a (file_path, arcname) pair and, for regular files small
+    enough to hold in memory, deflate the contents.
+
+    Returns (file_path, zinfo, payload); payload is None for entries that should
+    be written with ZipFile.write instead, and zinfo is None if the file is missing.
+    """
+    file_path, arcname = entry
+    try:
+        zinfo = zipfile.ZipInfo.from_file(file_path, arcname, strict_timestamps=False)
+    except FileNotFoundError:
+        return file_path, None, None
+    if (
+        zinfo.is_dir()
+        or zinfo.file_size > _PARALLEL_DEFLATE_MAX_FILE_SIZE
+        or _zip_compress_type(file_path) != zipfile.ZIP_DEFLATED
+    ):
+        return file_path, zinfo, None
+
+    with open(file_path, "rb") as f:
+        data = f.read()
+    payload = _raw_deflate(data)
+
+    zinfo.compress_type = zipfile.ZIP_DEFLATED
+    zinfo.file_size = len(data)
+    zinfo.compress_size = len(payload)
+    zinfo.CRC = zlib.crc32(data)
+    return file_path, zinfo, payload
+
+
+def _write_deflated_zip_entry(zipf: zipfile.ZipFile, zinfo: zipfile.ZipInfo, payload: bytes):
+    """
+    Append an entry whose data is already raw-deflated and whose CRC and sizes are set.
+
+    zipfile has no public API for this, so this mirrors what ZipFile.open(zinfo, "w")
+    does for a seekable archive, minus the compression step.
+    """
+    zip64 = zinfo.file_size > zipfile.ZIP64_LIMIT or zinfo.compress_size > zipfile.ZIP64_LIMIT
+    with zipf._lock:
+        zipf.fp.seek(zipf.start_dir)
+        zinfo.header_offset = zipf.fp.tell()
+        zipf._writecheck(zinfo)
+        zipf._didModify = True
+        zipf.fp.write(zinfo.FileHeader(zip64))
+        zipf.fp.write(payload)
+        zipf.start_dir = zipf.fp.tell()
+        zipf.filelist.append(zinfo)
+        zipf.NameToInfo[zinfo.filename] = zinfo
+
+
+def _bounded_map(executor, fn, items, window):
+    """Like executor.map, but keeps at most `window` results in flight."""
+    pending = collections.deque()
+    for item in items:
+        pending.append(executor.submit(fn, item))
+        if len(pending) >= window:
+            yield pending.popleft().result()
+    while pending:
+        yield pending.popleft().result()
+
+
+def _write_zip(zip_filename, entries):
+    """
+    Write (file_path, arcname) entries to zip_filename, deflating file contents on a
+    thread pool while a single writer appends them to the archive in order.
+    """
+    # strict_timestamps=False clamps pre-1980 mtimes instead of failing the whole archive
+    with zipfile.ZipFile(zip_filename, "w", zipfile.ZIP_DEFLATED, strict_timestamps=False) as zipf:
+
+        def write(file_path, zinfo, payload):
+            if zinfo is None:
+                print(f"File not found. Not including in zip: {file_path}")
+            elif payload is None:
+                zipf.write(file_path, zinfo.filename, compress_type=_zip_compress_type(file_path))
+            else:
+                _write_deflated_zip_entry(zipf, zinfo, payload)
+
+        entries = iter(entries)
+        seen_size = 0
+        for entry in entries:
+            file_path, zinfo, payload = _deflate_zip_entry(entry)
+            write(file_path, zinfo, payload)
+            if zinfo is not None:
+                seen_size += zinfo.file_size
+            if seen_size >= _PARALLEL_ZIP_MIN_SIZE:
+                break
         else:
-            status_reason = guess_status_code_reason(response.status_code, response.read())
-            raise DownloadException(f"Failed to download file.\n{status_reason}")
+            return
+
+        with concurrent.futures.ThreadPoolExecutor(max_workers=_ZIP_WORKERS) as executor:
+            for result in _bounded_map(executor, _deflate_zip_entry, entries, 2 * _ZIP_WORKERS):
+                write(*result)
+
+
+def _list_index_paths(pygit2, base_path):
+    """
+    Read the paths tracked under base_path straight from the git index, relative to
+    base_path like git ls-files. Returns None if base_path isn't in a work tree.
+    """
+    repo_path = pygit2.discover_repository(base_path)
+    if repo_path is None:
+        return None
+    repo = pygit2.Repository(repo_path)
+    if repo.is_bare:
+        return None
+
+    prefix = os.path.relpath(os.path.realpath(base_path), os.path.realpath(repo.workdir))
+    if prefix == ".":
+        return [entry.path for entry in repo.index]
+    prefix = prefix.replace(os.sep, "/") + "/"
+    return [entry.path[len(prefix) :] for entry in repo.index if entry.path.startswith(prefix)]
+
+
+def list_git_tracked_files(base_path="."):
+    """
+    List the files tracked by git under base_path.
+
+    If pygit2 is installed the index is read in-process; otherwise this runs
+    git ls-files, with NUL-delimited output so paths with special characters are
+    returned verbatim instead of git's quoted form. Raises if base_path is not a git
+    repository or git is not installed.
+    """
+    try:
+        import pygit2
+    except ImportError:
+        pass
+    else:
+        paths = _list_index_paths(pygit2, base_path)
+        if paths is not None:
+            return paths
+
+    output = subprocess.check_output(["git", "-C", base_path, "ls-files", "-z"])
+    return (os.fsdecode(path) for path in output.split(b"\x00") if path)
 
 
 def zip_files(zip_filename):
     """
     Zip all files in the current directory that are tracked by git.
     """
-    try:
-        # Get list of git-tracked files using git ls-files
-        import subprocess
+    # Path of the archive itself relative to the current directory, as produced by
+    # the directory walk below and (with forward slashes) by git ls-files, so it can be skipped
+    zip_rel_path = os.path.relpath(zip_filename)
+    zip_git_path = zip_rel_path.replace(os.sep, "/")
 
-        git_files = subprocess.check_output(["git", "ls-files"], text=True).splitlines()
+    entries = []
+    try:
         # Zip only git-tracked files
-        with zipfile.ZipFile(zip_filename, "w", zipfile.ZIP_DEFLATED) as zipf:
-            for file_path in git_files:
-                if zip_filename in file_path:
-                    continue
-                if os.path.exists(file_path):
-                    zipf.write(file_path)
-                else:
-                    print(f"File not found. Not including in zip: {file_path}")
-        return
+        for file_path in list_git_tracked_files():
+            if file_path == zip_git_path:
+                continue
+            # Missing files (e.g. deleted but not yet staged) are reported when zipping
+            entries.append((file_path, file_path))
     except (subprocess.SubprocessError, FileNotFoundError):
         print("Warning: Not in a git repository or git not installed. Zipping all files.")
 
-    with zipfile.ZipFile(zip_filename, "w", zipfile.ZIP_DEFLATED) as zipf:
-        for root, dirs, files in os.walk("."):
-            if ".git" in dirs:
-                dirs.remove(".git")
-            for file in files:
-                file_path = os.path.join(root, file)
-                # Skip zipping the zip file itself
-                if zip_filename in file_path:
-                    continue
-                relative_path = os.path.relpath(file_path, start=".")
-                zipf.write(file_path, relative_path)
+        root_prefix_len = len(os.path.join(".", ""))
+        for entry in iter_files(".", skip_dirs={".git"}):
+            # entry.path is "./<relative path>"
+            relative_path = entry.path[root_prefix_len:]
+            # Skip zipping the zip file itself
+            if relative_path == zip_rel_path:
+                continue
+            entries.append((entry.path, relative_path))
+
+    _write_zip(zip_filename, entries)
 
 
 def upload_file_to_signed_url(signed_url: str, file_path: str):
     with open(file_path, "rb") as f:
-        headers = {"Content-Type": "application/zip"}
-        response = requests.put(signed_url, data=f, headers=headers)
+        # Passing the file object (rather than a generator) lets requests stream it
+        # from disk; an explicit Content-Length keeps it from ever falling back to
+        # chunked transfer encoding, which signed-URL endpoints reject.
+        headers = {
+            "Content-Type": "application/zip",
+            "Content-Length": str(os.fstat(f.fileno()).st_size),
+        }
+        response = _session.put(signed_url, data=f, headers=headers, timeout=(10, 300))
 
         if response.status_code == 200:
             print("Upload successful.")
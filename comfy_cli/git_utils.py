@@ -1,4 +1,3 @@
-import os
 import subprocess
 
 from rich.console import Console
@@ -16,17 +15,12 @@ def git_checkout_tag(repo_path: str, tag: str) -> bool:
     :param tag: The tag to checkout
     :return: The output of the git command if successful, None if an error occurred
     """
-    original_dir = os.getcwd()
     try:
-        # Change to the repository directory
-
-        os.chdir(repo_path)
-
         # Fetch the latest tags
-        subprocess.run(["git", "fetch", "--tags"], check=True, capture_output=True, text=True)
+        subprocess.run(["git", "fetch", "--tags"], cwd=repo_path, check=True, capture_output=True, text=True)
 
         # Checkout the specified tag
-        subprocess.run(["git", "checkout", tag], check=True, capture_output=True, text=True)
+        subprocess.run(["git", "checkout", tag], cwd=repo_path, check=True, capture_output=True, text=True)
 
         console.print(f"[bold green]Successfully checked out tag: [cyan]{tag}[/cyan][/bold green]")
 
@@ -53,6 +47,3 @@ def git_checkout_tag(repo_path: str, tag: str) -> bool:
         )
 
         return False
-    finally:
-        # Ensure we always return to the original directory
-        os.chdir(original_dir)
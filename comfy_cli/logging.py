@@ -8,6 +8,10 @@ Therefore, it's a good idea to encapsulate logging-related code in a separate mo
 import logging
 import os
 
+# Messages use %-style arguments, e.g. debug("Installing %s", node_id), so the string
+# is only formatted if the record is actually emitted.
+_logger = logging.getLogger("comfy_cli")
+
 
 def setup_logging():
     # TODO: consider supporting different ways of outputting logs
@@ -27,18 +31,18 @@ def setup_logging():
     )
 
 
-def debug(message):
-    logging.debug(message)
+def debug(message, *args):
+    _logger.debug(message, *args)
 
 
-def info(message):
-    logging.info(message)
+def info(message, *args):
+    _logger.info(message, *args)
 
 
-def warning(message):
-    logging.warning(message)
+def warning(message, *args):
+    _logger.warning(message, *args)
 
 
-def error(message):
-    logging.error(message)
+def error(message, *args):
+    _logger.error(message, *args)
     # TODO: consider tracking errors to Mixpanel as well.
@@ -1,8 +1,11 @@
 import json
 import logging
 import os
+from operator import itemgetter
 
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 # Reduced global imports from comfy_cli.registry
 from comfy_cli.registry.types import (
@@ -13,10 +16,34 @@ from comfy_cli.registry.types import (
     PyProjectConfig,
 )
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def _response_json(response):
+    """Decode a JSON response body, with orjson when it is installed."""
+    if orjson is not None:
+        return orjson.loads(response.content)
+    return response.json()
+
+
+# Mandatory fields of API payloads, fetched in one C-level call; a missing one raises KeyError
+_node_version_required = itemgetter("id", "version")
+_node_required = itemgetter("id", "name", "description")
+
 
 class RegistryAPI:
     def __init__(self):
         self.base_url = self.determine_base_url()
+        # Keep-alive pool so consecutive registry calls skip the TCP/TLS handshake.
+        # Retry's defaults only resend idempotent methods (or requests that never
+        # reached the server), so a publish is never submitted twice.
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_maxsize=16, max_retries=Retry(total=3, backoff_factor=0.3))
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
 
     def determine_base_url(self):
         env = os.getenv("ENVIRONMENT")
@@ -62,13 +89,11 @@ class RegistryAPI:
         }
         print(request_body)
         url = f"{self.base_url}/publishers/{node_config.tool_comfy.publisher_id}/nodes/{node_config.project.name}/versions"
-        headers = {"Content-Type": "application/json"}
-        body = request_body
-
-        response = requests.post(url, headers=headers, data=json.dumps(body))
+        # json= serialises the body and sets the application/json Content-Type
+        response = self.session.post(url, json=request_body)
 
         if response.status_code == 201:
-            data = response.json()
+            data = _response_json(response)
             return PublishNodeVersionResponse(
                 node_version=map_node_version(data["node_version"]),
                 signedUrl=data["signedUrl"],
@@ -84,9 +109,9 @@ class RegistryAPI:
           list: A list of Node instances.
         """
         url = f"{self.base_url}/nodes"
-        response = requests.get(url)
+        response = self.session.get(url)
         if response.status_code == 200:
-            raw_nodes = response.json()["nodes"]
+            raw_nodes = _response_json(response)["nodes"]
             mapped_nodes = [map_node_to_node_class(node) for node in raw_nodes]
             return mapped_nodes
         else:
@@ -108,11 +133,12 @@ class RegistryAPI:
         else:
             url = f"{self.base_url}/nodes/{node_id}/install?version={version}"
 
-        response = requests.get(url)
+        response = self.session.get(url)
         if response.status_code == 200:
             # Convert the API response to a NodeVersion object
-            logging.debug(f"RegistryAPI install_node response: {response.json()}")
-            return map_node_version(response.json())
+            node_version = _response_json(response)
+            logging.debug("RegistryAPI install_node response: %s", node_version)
+            return map_node_version(node_version)
         else:
             raise Exception(f"Failed to install node: {response.status_code} - {response.text}")
 
@@ -127,14 +153,15 @@ def map_node_version(api_node_version):
     Returns:
         NodeVersion: An instance of NodeVersion dataclass populated with data from the API.
     """
+    node_version_id, version = _node_version_required(api_node_version)
     return NodeVersion(
         changelog=api_node_version.get("changelog", ""),  # Provide a default value if 'changelog' is missing
         dependencies=api_node_version.get(
             "dependencies", []
         ),  # Provide a default empty list if 'dependencies' is missing
         deprecated=api_node_version.get("deprecated", False),  # Assume False if 'deprecated' is not specified
-        id=api_node_version["id"],  # 'id' should be mandatory; raise KeyError if missing
-        version=api_node_version["version"],  # 'version' should be mandatory; raise KeyError if missing
+        id=node_version_id,
+        version=version,
         download_url=api_node_version.get("downloadUrl", ""),  # Provide a default value if 'downloadUrl' is missing
     )
 
@@ -149,18 +176,18 @@ def map_node_to_node_class(api_node_data):
     Returns:
         Node: An instance of Node dataclass populated with API data.
     """
+    node_id, name, description = _node_required(api_node_data)
+    latest_version = api_node_data.get("latest_version")
     return Node(
-        id=api_node_data["id"],
-        name=api_node_data["name"],
-        description=api_node_data["description"],
+        id=node_id,
+        name=name,
+        description=description,
         author=api_node_data.get("author"),
         license=api_node_data.get("license"),
         icon=api_node_data.get("icon"),
         repository=api_node_data.get("repository"),
         tags=api_node_data.get("tags", []),
-        latest_version=(
-            map_node_version(api_node_data["latest_version"]) if "latest_version" in api_node_data else None
-        ),
+        latest_version=map_node_version(latest_version) if latest_version is not None else None,
     )
 
 
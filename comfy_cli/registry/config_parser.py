@@ -1,11 +1,18 @@
 import os
+import re
 import subprocess
-from typing import Optional
+from typing import TYPE_CHECKING, Optional
 
-import tomlkit
-import tomlkit.exceptions
 import typer
 
+try:
+    import tomllib
+except ImportError:  # Python < 3.11
+    try:
+        import tomli as tomllib
+    except ImportError:
+        tomllib = None
+
 from comfy_cli import ui
 from comfy_cli.registry.types import (
     ComfyConfig,
@@ -16,8 +23,14 @@ from comfy_cli.registry.types import (
     URLs,
 )
 
+if TYPE_CHECKING:
+    import tomlkit
+
+
+def _build_default_config() -> "tomlkit.TOMLDocument":
+    # tomlkit is only needed to write a pyproject.toml; reading goes through _load_toml
+    import tomlkit
 
-def create_comfynode_config():
     # Create the initial structure of the TOML document
     document = tomlkit.document()
 
@@ -54,14 +67,27 @@ def create_comfynode_config():
     # models.append(model)
     # comfy["Models"] = models
 
+    return document
+
+
+def create_comfynode_config():
+    import tomlkit
+
+    document = _build_default_config()
+
     # Write the TOML document to a file
     try:
-        with open("pyproject.toml", "w") as toml_file:
-            toml_file.write(tomlkit.dumps(document))
+        with open("pyproject.toml", "wb") as toml_file:
+            toml_file.write(tomlkit.dumps(document).encode("utf-8"))
     except IOError as e:
         raise Exception("Failed to write 'pyproject.toml'") from e
 
 
+# Strips, in this order and each at most once, the prefixes "comfyui-", "comfyui_",
+# "comfy-", "comfy_", "comfy" and "comfyui", like chained str.removeprefix calls.
+_COMFY_PREFIXES_RE = re.compile(r"^(?:comfyui-)?(?:comfyui_)?(?:comfy-)?(?:comfy_)?(?:comfy)?(?:comfyui)?")
+
+
 def sanitize_node_name(name: str) -> str:
     """Remove common ComfyUI-related prefixes from a string.
 
@@ -71,26 +97,14 @@ def sanitize_node_name(name: str) -> str:
     Returns:
         The string with any ComfyUI-related prefix removed
     """
-    name = name.lower()
-    prefixes = [
-        "comfyui-",
-        "comfyui_",
-        "comfy-",
-        "comfy_",
-        "comfy",
-        "comfyui",
-    ]
-
-    for prefix in prefixes:
-        name = name.removeprefix(prefix)
-    return name
+    return _COMFY_PREFIXES_RE.sub("", name.lower(), count=1)
 
 
 def initialize_project_config():
-    create_comfynode_config()
+    import tomlkit
 
-    with open("pyproject.toml", "r") as file:
-        document = tomlkit.parse(file.read())
+    # Fill in the defaults in memory and write the file once
+    document = _build_default_config()
 
     # Get the current git remote URL
     try:
@@ -102,14 +116,13 @@ def initialize_project_config():
     if git_remote_url.startswith("git@github.com:"):
         git_remote_url = git_remote_url.replace("git@github.com:", "https://github.com/")
 
-    # Ensure the URL ends with `.git` and remove it to obtain the plain URL
-    repo_name = git_remote_url.rsplit("/", maxsplit=1)[-1].replace(".git", "")
-    git_remote_url = git_remote_url.replace(".git", "")
+    # Remove a trailing `.git` to obtain the plain URL
+    git_remote_url = git_remote_url.removesuffix(".git")
+    repo_name = git_remote_url.rsplit("/", maxsplit=1)[-1]
 
-    project = document.get("project", tomlkit.table())
-    urls = project.get("urls", tomlkit.table())
-    urls["Repository"] = git_remote_url
-    project["urls"] = urls
+    # _build_default_config() always provides these tables, so no fallback tables are built
+    project = document["project"]
+    project["urls"]["Repository"] = git_remote_url
     project["name"] = sanitize_node_name(repo_name)
     project["description"] = ""
     project["version"] = "1.0.0"
@@ -119,38 +132,66 @@ def initialize_project_config():
     license_table["file"] = "LICENSE"
     project["license"] = license_table
 
-    tool = document.get("tool", tomlkit.table())
-    comfy = tool.get("comfy", tomlkit.table())
-    comfy["DisplayName"] = repo_name
-    tool["comfy"] = comfy
-    document["tool"] = tool
+    document["tool"]["comfy"]["DisplayName"] = repo_name
 
     # Handle dependencies
-    if os.path.exists("requirements.txt"):
-        with open("requirements.txt", "r") as req_file:
-            dependencies = [line.strip() for line in req_file if line.strip()]
-        project["dependencies"] = dependencies
-    else:
+    try:
+        with open("requirements.txt", "r", encoding="utf-8") as req_file:
+            requirements = req_file.read()
+    except FileNotFoundError:
         print("Warning: 'requirements.txt' not found. No dependencies will be added.")
+    else:
+        project["dependencies"] = [line for line in map(str.strip, requirements.splitlines()) if line]
 
     # Write the updated config to a new file in the current directory
     try:
-        with open("pyproject.toml", "w") as toml_file:
-            toml_file.write(tomlkit.dumps(document))
+        with open("pyproject.toml", "wb") as toml_file:
+            toml_file.write(tomlkit.dumps(document).encode("utf-8"))
         print("pyproject.toml has been created successfully in the current directory.")
     except IOError as e:
         raise IOError("Failed to write 'pyproject.toml'") from e
 
 
+# ((absolute path, st_mtime_ns), parsed data) of the last _load_toml() read
+_toml_cache = None
+
+
+def _load_toml(path: str) -> dict:
+    """
+    Parse a TOML file that is only read, never written back. tomllib (or tomli) is far
+    faster than tomlkit, which is only needed where formatting must round-trip.
+
+    Either way plain dicts and lists come back, so lookups skip tomlkit's Container layer.
+    The parsed data is reused until the file's mtime changes, so callers must not mutate it.
+    """
+    global _toml_cache
+
+    key = (os.path.abspath(path), os.stat(path).st_mtime_ns)
+    if _toml_cache is not None and _toml_cache[0] == key:
+        return _toml_cache[1]
+
+    if tomllib is not None:
+        with open(path, "rb") as file:
+            data = tomllib.load(file)
+    else:
+        import tomlkit
+
+        with open(path, "r") as file:
+            data = tomlkit.load(file).unwrap()
+    _toml_cache = (key, data)
+    return data
+
+
 def extract_node_configuration(
-    path: str = os.path.join(os.getcwd(), "pyproject.toml"),
+    path: Optional[str] = None,
 ) -> Optional[PyProjectConfig]:
+    if path is None:
+        path = os.path.join(os.getcwd(), "pyproject.toml")
     if not os.path.isfile(path):
         ui.display_error_message("No pyproject.toml file found in the current directory.")
         return None
 
-    with open(path, "r") as file:
-        data = tomlkit.load(file)
+    data = _load_toml(path)
 
     project_data = data.get("project", {})
     urls_data = project_data.get("urls", {})
@@ -181,7 +222,7 @@ def extract_node_configuration(
         description=project_data.get("description", ""),
         version=project_data.get("version", ""),
         requires_python=project_data.get("requires-python", ""),
-        dependencies=project_data.get("dependencies", []),
+        dependencies=list(project_data.get("dependencies", [])),
         license=license,
         urls=URLs(
             homepage=urls_data.get("Homepage", ""),
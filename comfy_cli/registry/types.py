@@ -1,8 +1,10 @@
 from dataclasses import dataclass, field
 from typing import List, Optional
 
+from comfy_cli.typing import DATACLASS_SLOTS
 
-@dataclass
+
+@dataclass(**DATACLASS_SLOTS)
 class NodeVersion:
     changelog: str
     dependencies: List[str]
@@ -12,7 +14,7 @@ class NodeVersion:
     download_url: str
 
 
-@dataclass
+@dataclass(**DATACLASS_SLOTS)
 class Node:
     id: str
     name: str
@@ -25,13 +27,13 @@ class Node:
     latest_version: Optional[NodeVersion] = None
 
 
-@dataclass
+@dataclass(**DATACLASS_SLOTS)
 class PublishNodeVersionResponse:
     node_version: NodeVersion
     signedUrl: str
 
 
-@dataclass
+@dataclass(**DATACLASS_SLOTS)
 class URLs:
     homepage: str = ""
     documentation: str = ""
@@ -39,13 +41,13 @@ class URLs:
     issues: str = ""
 
 
-@dataclass
+@dataclass(**DATACLASS_SLOTS)
 class Model:
     location: str
     model_url: str
 
 
-@dataclass
+@dataclass(**DATACLASS_SLOTS)
 class ComfyConfig:
     publisher_id: str = ""
     display_name: str = ""
@@ -53,13 +55,13 @@ class ComfyConfig:
     models: List[Model] = field(default_factory=list)
 
 
-@dataclass
+@dataclass(**DATACLASS_SLOTS)
 class License:
     file: str = ""
     text: str = ""
 
 
-@dataclass
+@dataclass(**DATACLASS_SLOTS)
 class ProjectConfig:
     name: str = ""
     description: str = ""
@@ -70,7 +72,7 @@ class ProjectConfig:
     urls: URLs = field(default_factory=URLs)
 
 
-@dataclass
+@dataclass(**DATACLASS_SLOTS)
 class PyProjectConfig:
     project: ProjectConfig = field(default_factory=ProjectConfig)
     tool_comfy: ComfyConfig = field(default_factory=ComfyConfig)
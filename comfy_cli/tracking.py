@@ -44,7 +44,7 @@ def disable():
 def track_event(event_name: str, properties: any = None):
     if properties is None:
         properties = {}
-    logging.debug(f"tracking event called with event_name: {event_name} and properties: {properties}")
+    logging.debug("tracking event called with event_name: %s and properties: %s", event_name, properties)
     enable_tracking = config_manager.get(constants.CONFIG_KEY_ENABLE_TRACKING)
     if not enable_tracking:
         return
@@ -54,7 +54,7 @@ def track_event(event_name: str, properties: any = None):
         properties["tracing_id"] = tracing_id
         mp.track(distinct_id=user_id, event_name=event_name, properties=properties)
     except Exception as e:
-        logging.warning(f"Failed to track event: {e}")  # Log the error but do not raise
+        logging.warning("Failed to track event: %s", e)  # Log the error but do not raise
 
 
 def track_command(sub_command: str = None):
@@ -71,7 +71,7 @@ def track_command(sub_command: str = None):
             # Remove context and ctx from the dictionary as they are not needed for tracking and not serializable.
             filtered_kwargs = {k: v for k, v in kwargs.items() if k != "ctx" and k != "context"}
 
-            logging.debug(f"Tracking command: {command_name} with arguments: {filtered_kwargs}")
+            logging.debug("Tracking command: %s with arguments: %s", command_name, filtered_kwargs)
             track_event(command_name, properties=filtered_kwargs)
 
             return func(*args, **kwargs)
@@ -97,17 +97,17 @@ def init_tracking(enable_tracking: bool):
     """
     Initialize the tracking system by setting the user identifier and tracking enabled status.
     """
-    logging.debug(f"Initializing tracking with enable_tracking: {enable_tracking}")
+    logging.debug("Initializing tracking with enable_tracking: %s", enable_tracking)
     config_manager.set(constants.CONFIG_KEY_ENABLE_TRACKING, str(enable_tracking))
     if not enable_tracking:
         return
 
     curr_user_id = config_manager.get(constants.CONFIG_KEY_USER_ID)
-    logging.debug(f'User identifier for tracking user_id found: {curr_user_id}."')
+    logging.debug('User identifier for tracking user_id found: %s."', curr_user_id)
     if curr_user_id is None:
         curr_user_id = str(uuid.uuid4())
         config_manager.set(constants.CONFIG_KEY_USER_ID, curr_user_id)
-        logging.debug(f'Setting user identifier for tracking user_id: {curr_user_id}."')
+        logging.debug('Setting user identifier for tracking user_id: %s."', curr_user_id)
 
     # Note: only called once when the user interacts with the CLI for the
     #  first time iff the permission is granted.
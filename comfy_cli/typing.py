@@ -1,4 +1,9 @@
 import os
+import sys
 from typing import Union
 
 PathLike = Union[os.PathLike[str], str]
+
+# Keyword arguments for @dataclass that drop the per-instance __dict__ where dataclasses
+# support it (Python 3.10+); on 3.9 the decorated classes stay plain dataclasses
+DATACLASS_SLOTS = {"slots": True} if sys.version_info >= (3, 10) else {}
@@ -2,7 +2,11 @@
 Module for utility functions.
 """
 
+import collections
+import concurrent.futures
+import contextlib
 import functools
+import os
 import platform
 import shutil
 import subprocess
@@ -17,9 +21,25 @@ from rich import print, progress
 from rich.live import Live
 from rich.table import Table
 
-from comfy_cli.constants import DEFAULT_COMFY_WORKSPACE, OS, PROC
+from comfy_cli.constants import OS, PROC, default_comfy_workspace
 from comfy_cli.typing import PathLike
 
+try:
+    import rapidgzip
+except ImportError:
+    rapidgzip = None
+
+# copyfileobj defaults to 64 KiB reads; standalone python tarballs are tens of MB,
+# so bigger reads mean far fewer progress updates and write calls
+_COPY_BUFSIZE = 1 << 20
+
+# A standalone python is thousands of small files, so extraction is dominated by
+# open/write/close calls that can overlap; payloads waiting on a writer are capped
+_EXTRACT_WORKERS = min(32, (os.cpu_count() or 1) * 4)
+_EXTRACT_MAX_PENDING_BYTES = 64 << 20
+# Bigger members are streamed to disk on the main thread rather than read into memory
+_PARALLEL_EXTRACT_MAX_FILE_SIZE = 8 << 20
+
 
 def singleton(cls):
     """
@@ -31,12 +51,13 @@ def singleton(cls):
         pass
 
     """
-    instances = {}
+    instance = None
 
     def get_instance(*args, **kwargs):
-        if cls not in instances:
-            instances[cls] = cls(*args, **kwargs)
-        return instances[cls]
+        nonlocal instance
+        if instance is None:
+            instance = cls(*args, **kwargs)
+        return instance
 
     return get_instance
 
@@ -75,7 +96,7 @@ def install_conda_package(package_name):
 
 
 def get_not_user_set_default_workspace():
-    return DEFAULT_COMFY_WORKSPACE[get_os()]
+    return default_comfy_workspace(get_os())
 
 
 def kill_all(pid):
@@ -104,6 +125,30 @@ def create_choice_completer(opts: list[str]):
     return f
 
 
+def iter_files(root: PathLike, skip_dirs=frozenset()):
+    """
+    Yield an os.DirEntry for every file under root, like os.walk but cheaper: scandir
+    reports each entry's type from the directory listing, so no stat call is needed.
+
+    Directories named in skip_dirs are not descended into. As with os.walk, symlinks
+    to directories are neither followed nor yielded, and unreadable directories are
+    skipped.
+    """
+    stack = [os.fspath(root)]
+    while stack:
+        try:
+            it = os.scandir(stack.pop())
+        except OSError:
+            continue
+        with it:
+            for entry in it:
+                if entry.is_dir(follow_symlinks=False):
+                    if entry.name not in skip_dirs:
+                        stack.append(entry.path)
+                elif not entry.is_dir():
+                    yield entry
+
+
 def download_url(
     url: str,
     fname: PathLike,
@@ -128,13 +173,111 @@ def download_url(
             desc = f"downloading {fname}..." + ("(Unknown total file size)" if fsize == 0 else "")
 
             with progress.wrap_file(response.raw, total=fsize, description=desc) as response_raw:
-                shutil.copyfileobj(response_raw, f)
+                shutil.copyfileobj(response_raw, f, _COPY_BUFSIZE)
         else:
-            shutil.copyfileobj(response.raw, f)
+            shutil.copyfileobj(response.raw, f, _COPY_BUFSIZE)
 
     return fpath
 
 
+@contextlib.contextmanager
+def _open_tar_reader(inPath: Path):
+    """
+    Open the tarball at inPath as a forward-only stream. If rapidgzip is installed a
+    gzipped archive is inflated on every core; otherwise tarfile decompresses it on one.
+    """
+    if rapidgzip is not None:
+        with open(inPath, "rb") as f:
+            is_gzip = f.read(2) == b"\x1f\x8b"
+        if is_gzip:
+            with rapidgzip.open(str(inPath), parallelization=os.cpu_count() or 1) as f:
+                with tarfile.open(fileobj=f, mode="r|", bufsize=_COPY_BUFSIZE) as tar:
+                    yield tar
+            return
+
+    with tarfile.open(inPath, "r|*", bufsize=_COPY_BUFSIZE) as tar:
+        yield tar
+
+
+def _write_tar_member(tar: tarfile.TarFile, tinfo: tarfile.TarInfo, targetpath: str, data: bytes):
+    with open(targetpath, "wb") as f:
+        f.write(data)
+    try:
+        tar.chown(tinfo, targetpath, numeric_owner=False)
+        tar.chmod(tinfo, targetpath)
+        tar.utime(tinfo, targetpath)
+    except tarfile.ExtractError:
+        # non-fatal at tarfile's default errorlevel, same as extractall
+        pass
+
+
+def _extract_members(tar: tarfile.TarFile, filter=None):
+    """
+    Extract all members of a streaming tarfile into the current directory, like
+    tar.extractall(). Regular files up to _PARALLEL_EXTRACT_MAX_FILE_SIZE are read
+    off the stream in order but written by a thread pool; larger ones are streamed
+    to disk by tarfile. Every other member first waits for pending writes (a hard
+    link needs its target on disk) and is then extracted by tarfile itself.
+    """
+    directories = []
+    pending = collections.deque()
+    pending_bytes = 0
+    pending_by_path = {}
+
+    def drain(max_bytes):
+        nonlocal pending_bytes
+        while pending and pending_bytes > max_bytes:
+            future, size = pending.popleft()
+            future.result()
+            pending_bytes -= size
+        if not pending:
+            pending_by_path.clear()
+
+    with concurrent.futures.ThreadPoolExecutor(max_workers=_EXTRACT_WORKERS) as executor:
+        for member in tar:
+            tinfo = member if filter is None else filter(member, "")
+            if tinfo is None:
+                continue
+
+            if tinfo.isreg() and not tinfo.issparse():
+                targetpath = tinfo.name.rstrip("/").replace("/", os.sep)
+                # A later member with the same name replaces an earlier one, so it
+                # mustn't be written before the earlier write has finished
+                earlier_write = pending_by_path.pop(targetpath, None)
+                if earlier_write is not None:
+                    earlier_write.result()
+
+                if tinfo.size > _PARALLEL_EXTRACT_MAX_FILE_SIZE:
+                    tar.extract(tinfo, filter="fully_trusted")
+                    continue
+
+                upperdirs = os.path.dirname(targetpath)
+                if upperdirs:
+                    os.makedirs(upperdirs, exist_ok=True)
+                data = tar.extractfile(member).read()
+                drain(_EXTRACT_MAX_PENDING_BYTES - len(data))
+                future = executor.submit(_write_tar_member, tar, tinfo, targetpath, data)
+                pending.append((future, len(data)))
+                pending_by_path[targetpath] = future
+                pending_bytes += len(data)
+                continue
+
+            drain(-1)
+            if tinfo.isdir():
+                # like extractall, directory attributes are set once their contents are written
+                directories.append(tinfo)
+            tar.extract(tinfo, set_attrs=not tinfo.isdir(), filter="fully_trusted")
+        drain(-1)
+
+    for tinfo in sorted(directories, key=lambda d: d.name, reverse=True):
+        try:
+            tar.chown(tinfo, tinfo.name, numeric_owner=False)
+            tar.utime(tinfo, tinfo.name)
+            tar.chmod(tinfo, tinfo.name)
+        except tarfile.ExtractError:
+            pass
+
+
 def extract_tarball(
     inPath: PathLike,
     outPath: Optional[PathLike] = None,
@@ -143,53 +286,81 @@ def extract_tarball(
     inPath = Path(inPath).expanduser().resolve()
     outPath = inPath.with_suffix("") if outPath is None else Path(outPath).expanduser().resolve()
 
-    with tarfile.open(inPath) as tar:
+    # Read the archive in one forward pass: the first member gives the top-level name,
+    # and extraction continues from the same stream rather than inflating it twice
+    with _open_tar_reader(inPath) as tar:
         info = tar.next()
         old_name = info.name.split("/")[0]
-    # path to top-level of extraction result
-    extractPath = inPath.with_name(old_name)
+        # path to top-level of extraction result
+        extractPath = inPath.with_name(old_name)
 
-    # clean both the extraction path and the final target path
-    shutil.rmtree(extractPath, ignore_errors=True)
-    shutil.rmtree(outPath, ignore_errors=True)
+        # clean both the extraction path and the final target path
+        shutil.rmtree(extractPath, ignore_errors=True)
+        shutil.rmtree(outPath, ignore_errors=True)
 
-    if show_progress:
-        fileSize = inPath.stat().st_size
+        if show_progress:
+            fileSize = inPath.stat().st_size
 
-        barProg = progress.Progress()
-        barTask = barProg.add_task("[cyan]extracting tarball...", total=fileSize)
-        pathProg = progress.Progress(progress.TextColumn("{task.description}"))
-        pathTask = pathProg.add_task("")
+            barProg = progress.Progress()
+            barTask = barProg.add_task("[cyan]extracting tarball...", total=fileSize)
+            pathProg = progress.Progress(progress.TextColumn("{task.description}"))
+            pathTask = pathProg.add_task("")
 
-        progress_table = Table.grid()
-        progress_table.add_row(barProg)
-        progress_table.add_row(pathProg)
+            progress_table = Table.grid()
+            progress_table.add_row(barProg)
+            progress_table.add_row(pathProg)
 
-        _size = 0
+            _size = 0
 
-        def _filter(tinfo: tarfile.TarInfo, _path: PathLike):
-            nonlocal _size
-            pathProg.update(pathTask, description=tinfo.path)
-            barProg.advance(barTask, _size)
-            _size = tinfo.size
+            def _filter(tinfo: tarfile.TarInfo, _path: PathLike):
+                nonlocal _size
+                pathProg.update(pathTask, description=tinfo.path)
+                barProg.advance(barTask, _size)
+                _size = tinfo.size
 
-            # TODO: ideally we'd use data_filter here, but it's busted: https://github.com/python/cpython/issues/107845
-            # return tarfile.data_filter(tinfo, _path)
-            return tinfo
-    else:
-        _filter = None
+                # TODO: ideally we'd use data_filter here, but it's busted: https://github.com/python/cpython/issues/107845
+                # return tarfile.data_filter(tinfo, _path)
+                return tinfo
+        else:
+            _filter = None
 
-    with Live(progress_table, refresh_per_second=10):
-        with tarfile.open(inPath) as tar:
-            tar.extractall(filter=_filter)
+        with Live(progress_table, refresh_per_second=10):
+            # the already-read first member is extracted too, since the stream is still at its data
+            _extract_members(tar, filter=_filter)
 
-        if show_progress:
-            barProg.advance(barTask, _size)
-            pathProg.update(pathTask, description="")
+            if show_progress:
+                barProg.advance(barTask, _size)
+                pathProg.update(pathTask, description="")
 
     shutil.move(extractPath, outPath)
 
 
+@contextlib.contextmanager
+def _open_tar_gz_writer(outPath: Path):
+    """
+    Open outPath as a gzipped tarball for writing. If pigz is on PATH the tar stream is
+    piped through it so compression runs on every core; otherwise tarfile's
+    single-threaded zlib is used.
+    """
+    pigz = shutil.which("pigz")
+    if pigz is None:
+        with tarfile.open(outPath, "w:gz") as tar:
+            yield tar
+        return
+
+    with open(outPath, "wb") as f:
+        # -9 matches the compression level tarfile uses for "w:gz"
+        proc = subprocess.Popen([pigz, "-9", "-c", "-p", str(os.cpu_count() or 1)], stdin=subprocess.PIPE, stdout=f)
+        try:
+            with tarfile.open(fileobj=proc.stdin, mode="w|", bufsize=_COPY_BUFSIZE) as tar:
+                yield tar
+        finally:
+            proc.stdin.close()
+            returncode = proc.wait()
+    if returncode != 0:
+        raise subprocess.CalledProcessError(returncode, proc.args)
+
+
 def create_tarball(
     inPath: PathLike,
     outPath: Optional[PathLike] = None,
@@ -228,7 +399,7 @@ def create_tarball(
         _filter = None
 
     with Live(progress_table, refresh_per_second=10):
-        with tarfile.open(outPath, "w:gz") as tar:
+        with _open_tar_gz_writer(outPath) as tar:
             # don't include parent paths in archive
             tar.add(inPath.relative_to(cwd), filter=_filter)
 
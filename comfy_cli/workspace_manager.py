@@ -1,27 +1,37 @@
-import concurrent.futures
 import os
 from dataclasses import dataclass, field
 from datetime import datetime
 from enum import Enum
-from pathlib import Path
-from typing import List, Optional, Tuple
+from typing import TYPE_CHECKING, List, Optional, Tuple
 
-import git
 import typer
 import yaml
 from rich import print
 
 from comfy_cli import constants, logging, utils
 from comfy_cli.config_manager import ConfigManager
+from comfy_cli.typing import DATACLASS_SLOTS
 from comfy_cli.utils import singleton
 
+if TYPE_CHECKING:
+    import git
 
-@dataclass
+# Prefer the libyaml-backed safe loader/dumper; yaml.safe_load/safe_dump always use
+# the pure-Python implementation.
+try:
+    from yaml import CSafeDumper as _YamlDumper
+    from yaml import CSafeLoader as _YamlLoader
+except ImportError:
+    from yaml import SafeDumper as _YamlDumper
+    from yaml import SafeLoader as _YamlLoader
+
+
+@dataclass(**DATACLASS_SLOTS)
 class ModelPath:
     path: str
 
 
-@dataclass
+@dataclass(**DATACLASS_SLOTS)
 class Model:
     name: Optional[str] = None
     url: Optional[str] = None
@@ -30,28 +40,32 @@ class Model:
     type: Optional[str] = None
 
 
-@dataclass
+@dataclass(**DATACLASS_SLOTS)
 class Basics:
     name: Optional[str] = None
     updated_at: datetime = None
 
 
-@dataclass
+@dataclass(**DATACLASS_SLOTS)
 class CustomNode:
     # Todo: Add custom node fields for comfy-lock.yaml
     pass
 
 
-@dataclass
+@dataclass(**DATACLASS_SLOTS)
 class ComfyLockYAMLStruct:
     basics: Basics
     models: List[Model] = field(default_factory=list)
     custom_nodes: List[CustomNode] = field(default_factory=list)
 
 
-def check_comfy_repo(path) -> Tuple[bool, Optional[git.Repo]]:
+def check_comfy_repo(path) -> Tuple[bool, Optional["git.Repo"]]:
     if not os.path.exists(path):
         return False, None
+
+    # GitPython is slow to import, so only pay for it when a repo actually needs probing
+    import git
+
     try:
         repo = git.Repo(path, search_parent_directories=True)
         path_is_comfy_repo = any(remote.url in constants.COMFY_ORIGIN_URL_CHOICES for remote in repo.remotes)
@@ -123,13 +137,7 @@ def save_yaml(file_path: str, metadata: ComfyLockYAMLStruct):
         "custom_nodes": [],
     }
     with open(file_path, "w", encoding="utf-8") as file:
-        yaml.safe_dump(data, file, default_flow_style=False, allow_unicode=True)
-
-
-# Function to check if the file is config.json
-def check_file_is_model(path):
-    if path.name.endswith(constants.SUPPORTED_PT_EXTENSIONS):
-        return str(path)
+        yaml.dump(data, file, Dumper=_YamlDumper, default_flow_style=False, allow_unicode=True)
 
 
 class WorkspaceType(Enum):
@@ -152,6 +160,8 @@ class WorkspaceManager:
         self.workspace_path = None
         self.workspace_type = None
         self.skip_prompting = None
+        # ((lock file path, st_mtime_ns), parsed data) of the last load_metadata() read
+        self._metadata_cache = None
 
     def setup_workspace_manager(
         self,
@@ -278,38 +288,48 @@ class WorkspaceManager:
         if not self.workspace_path:
             return []
 
-        logging.info(f"Scanning directory: {self.workspace_path}")
-        model_files = []
-        for root, _dirs, files in os.walk(self.workspace_path):
-            for file in files:
-                if file.endswith(constants.SUPPORTED_PT_EXTENSIONS):
-                    model_files.append(os.path.join(root, file))
-        return model_files
+        logging.info("Scanning directory: %s", self.workspace_path)
+        return [
+            entry.path
+            for entry in utils.iter_files(self.workspace_path)
+            if entry.name.endswith(constants.SUPPORTED_PT_EXTENSIONS)
+        ]
 
     def scan_dir_concur(self):
-        base_path = Path(".")
-        model_files = []
-
-        # Use ThreadPoolExecutor to manage concurrency
-        with concurrent.futures.ThreadPoolExecutor() as executor:
-            futures = [executor.submit(check_file_is_model, p) for p in base_path.rglob("*")]
-            for future in concurrent.futures.as_completed(futures):
-                if future.result():
-                    model_files.append(future.result())
-
-        return model_files
+        # Checking an extension takes far less time than handing a path to a worker
+        # thread, so a single scandir walk beats fanning out per file.
+        root_prefix_len = len(os.path.join(".", ""))
+        return [
+            entry.path[root_prefix_len:]
+            for entry in utils.iter_files(".")
+            if entry.name.endswith(constants.SUPPORTED_PT_EXTENSIONS)
+        ]
 
     def load_metadata(self):
+        """
+        Returns the parsed comfy-lock.yaml of the workspace, or {} if there is none.
+
+        The parsed data is reused until the file's mtime changes, so callers must not
+        mutate the returned dict.
+        """
         file_path = os.path.join(self.workspace_path, constants.COMFY_LOCK_YAML_FILE)
-        if os.path.exists(file_path):
-            with open(file_path, "r", encoding="utf-8") as file:
-                return yaml.safe_load(file)
-        else:
+        try:
+            key = (file_path, os.stat(file_path).st_mtime_ns)
+        except FileNotFoundError:
             return {}
 
+        if self._metadata_cache is not None and self._metadata_cache[0] == key:
+            return self._metadata_cache[1]
+
+        with open(file_path, "r", encoding="utf-8") as file:
+            data = yaml.load(file, Loader=_YamlLoader)
+        self._metadata_cache = (key, data)
+        return data
+
     def save_metadata(self):
         file_path = os.path.join(self.workspace_path, constants.COMFY_LOCK_YAML_FILE)
         save_yaml(file_path, self.metadata)
+        self._metadata_cache = None
 
     def fill_print_table(self, table):
         table.add_row(
@@ -1,13 +1,28 @@
+import json
 import unittest
+from types import SimpleNamespace
 from unittest.mock import MagicMock, patch
 
 from comfy_cli.registry import PyProjectConfig
 from comfy_cli.registry.api import RegistryAPI
 from comfy_cli.registry.types import ComfyConfig, License, ProjectConfig, URLs
 
+try:
+    import orjson
+except ImportError:
+    # Stand-in with orjson's bytes-in loads(), so its code path is tested either way
+    orjson = SimpleNamespace(loads=json.loads)
+
 
 class TestRegistryAPI(unittest.TestCase):
+    # comfy_cli.registry.api.orjson for the tests: None decodes with response.json()
+    orjson = None
+
     def setUp(self):
+        orjson_patcher = patch("comfy_cli.registry.api.orjson", self.orjson)
+        orjson_patcher.start()
+        self.addCleanup(orjson_patcher.stop)
+
         self.registry_api = RegistryAPI()
         self.node_config = PyProjectConfig(
             project=ProjectConfig(
@@ -37,7 +52,7 @@ class TestRegistryAPI(unittest.TestCase):
         mock_getenv.return_value = "prod"
         self.assertEqual(self.registry_api.determine_base_url(), "https://api.comfy.org")
 
-    @patch("requests.post")
+    @patch("requests.Session.post")
     def test_publish_node_version_success(self, mock_post):
         mock_response = MagicMock()
         mock_response.status_code = 201
@@ -52,14 +67,16 @@ class TestRegistryAPI(unittest.TestCase):
             },
             "signedUrl": "https://example.com/signed",
         }
+        mock_response.content = json.dumps(mock_response.json.return_value).encode()
         mock_post.return_value = mock_response
 
         response = self.registry_api.publish_node_version(self.node_config, self.token)
         self.assertEqual(response.node_version.id, "test_node")
         self.assertEqual(response.node_version.version, "0.1.0")
         self.assertEqual(response.signedUrl, "https://example.com/signed")
+        self.assertEqual(mock_post.call_args.kwargs["json"]["node_version"]["dependencies"], ["dep1", "dep2"])
 
-    @patch("requests.post")
+    @patch("requests.Session.post")
     def test_publish_node_version_failure(self, mock_post):
         mock_response = MagicMock()
         mock_response.status_code = 400
@@ -70,7 +87,7 @@ class TestRegistryAPI(unittest.TestCase):
             self.registry_api.publish_node_version(self.node_config, self.token)
         self.assertIn("Failed to publish node version", str(context.exception))
 
-    @patch("requests.get")
+    @patch("requests.Session.get")
     def test_list_all_nodes_success(self, mock_get):
         mock_response = MagicMock()
         mock_response.status_code = 200
@@ -96,6 +113,7 @@ class TestRegistryAPI(unittest.TestCase):
                 }
             ]
         }
+        mock_response.content = json.dumps(mock_response.json.return_value).encode()
         mock_get.return_value = mock_response
 
         nodes = self.registry_api.list_all_nodes()
@@ -103,7 +121,7 @@ class TestRegistryAPI(unittest.TestCase):
         self.assertEqual(nodes[0].id, "node1")
         self.assertEqual(nodes[0].name, "Node 1")
 
-    @patch("requests.get")
+    @patch("requests.Session.get")
     def test_list_all_nodes_failure(self, mock_get):
         mock_response = MagicMock()
         mock_response.status_code = 500
@@ -114,7 +132,7 @@ class TestRegistryAPI(unittest.TestCase):
             self.registry_api.list_all_nodes()
         self.assertIn("Failed to retrieve nodes", str(context.exception))
 
-    @patch("requests.get")
+    @patch("requests.Session.get")
     def test_install_node_success(self, mock_get):
         mock_response = MagicMock()
         mock_response.status_code = 200
@@ -126,13 +144,14 @@ class TestRegistryAPI(unittest.TestCase):
             "deprecated": False,
             "downloadUrl": "https://example.com/download1",
         }
+        mock_response.content = json.dumps(mock_response.json.return_value).encode()
         mock_get.return_value = mock_response
 
         node_version = self.registry_api.install_node("node1")
         self.assertEqual(node_version.id, "node1")
         self.assertEqual(node_version.version, "1.0.0")
 
-    @patch("requests.get")
+    @patch("requests.Session.get")
     def test_install_node_failure(self, mock_get):
         mock_response = MagicMock()
         mock_response.status_code = 404
@@ -142,3 +161,9 @@ class TestRegistryAPI(unittest.TestCase):
         with self.assertRaises(Exception) as context:
             self.registry_api.install_node("node1")
         self.assertIn("Failed to install node", str(context.exception))
+
+
+class TestRegistryAPIWithOrjson(TestRegistryAPI):
+    """Runs every TestRegistryAPI test with responses decoded from .content by orjson."""
+
+    orjson = orjson
@@ -1,8 +1,9 @@
+import os
 from unittest.mock import mock_open, patch
 
 import pytest
 
-from comfy_cli.registry.config_parser import extract_node_configuration
+from comfy_cli.registry.config_parser import extract_node_configuration, initialize_project_config, tomllib
 from comfy_cli.registry.types import (
     License,
     Model,
@@ -52,7 +53,7 @@ def test_extract_node_configuration_success(mock_toml_data):
     with (
         patch("os.path.isfile", return_value=True),
         patch("builtins.open", mock_open()),
-        patch("tomlkit.load", return_value=mock_toml_data),
+        patch("comfy_cli.registry.config_parser._load_toml", return_value=mock_toml_data),
     ):
         result = extract_node_configuration("fake_path.toml")
 
@@ -85,7 +86,7 @@ def test_extract_node_configuration_license_text():
     with (
         patch("os.path.isfile", return_value=True),
         patch("builtins.open", mock_open()),
-        patch("tomlkit.load", return_value=mock_data),
+        patch("comfy_cli.registry.config_parser._load_toml", return_value=mock_data),
     ):
         result = extract_node_configuration("fake_path.toml")
         assert result is not None, "Expected PyProjectConfig, got None"
@@ -102,7 +103,7 @@ def test_extract_node_configuration_license_text_dict():
     with (
         patch("os.path.isfile", return_value=True),
         patch("builtins.open", mock_open()),
-        patch("tomlkit.load", return_value=mock_data),
+        patch("comfy_cli.registry.config_parser._load_toml", return_value=mock_data),
     ):
         result = extract_node_configuration("fake_path.toml")
 
@@ -120,10 +121,67 @@ def test_extract_license_incorrect_format():
     with (
         patch("os.path.isfile", return_value=True),
         patch("builtins.open", mock_open()),
-        patch("tomlkit.load", return_value=mock_data),
+        patch("comfy_cli.registry.config_parser._load_toml", return_value=mock_data),
     ):
         result = extract_node_configuration("fake_path.toml")
 
         assert result is not None, "Expected PyProjectConfig, got None"
         assert isinstance(result, PyProjectConfig)
         assert result.project.license == License(text="MIT")
+
+
+def test_extract_node_configuration_reads_file(tmp_path):
+    pyproject = tmp_path / "pyproject.toml"
+    pyproject.write_text(
+        '[project]\nname = "test-project"\nversion = "1.0.0"\ndependencies = ["requests"]\n'
+        'license = {file = "LICENSE"}\n\n[tool.comfy]\nPublisherId = "test-publisher"\n'
+    )
+
+    result = extract_node_configuration(str(pyproject))
+
+    assert result.project.name == "test-project"
+    assert result.project.dependencies == ["requests"]
+    assert result.project.license == License(file="LICENSE")
+    assert result.tool_comfy.publisher_id == "test-publisher"
+
+
+@pytest.mark.skipif(tomllib is None, reason="requires tomllib or tomli")
+def test_extract_node_configuration_reparses_only_on_mtime_change(tmp_path):
+    pyproject = tmp_path / "pyproject.toml"
+    pyproject.write_text('[project]\nname = "first"\n')
+    os.utime(pyproject, ns=(1_000_000_000, 1_000_000_000))
+
+    with patch("comfy_cli.registry.config_parser.tomllib.load", wraps=tomllib.load) as mock_load:
+        assert extract_node_configuration(str(pyproject)).project.name == "first"
+        assert extract_node_configuration(str(pyproject)).project.name == "first"
+        assert mock_load.call_count == 1
+
+        pyproject.write_text('[project]\nname = "second"\n')
+        os.utime(pyproject, ns=(2_000_000_000, 2_000_000_000))
+        assert extract_node_configuration(str(pyproject)).project.name == "second"
+        assert mock_load.call_count == 2
+
+
+def test_extract_node_configuration_defaults_to_current_directory(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / "pyproject.toml").write_text('[project]\nname = "cwd-project"\n')
+
+    assert extract_node_configuration().project.name == "cwd-project"
+
+
+def test_initialize_project_config_strips_only_trailing_git(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / "requirements.txt").write_text("requests\n\ntorch\n")
+
+    with patch(
+        "comfy_cli.registry.config_parser.subprocess.check_output",
+        return_value=b"https://git.example.gitlab.com/org/ComfyUI-Foo.git\n",
+    ):
+        initialize_project_config()
+
+    result = extract_node_configuration(str(tmp_path / "pyproject.toml"))
+
+    assert result.project.name == "foo"
+    assert result.project.urls.repository == "https://git.example.gitlab.com/org/ComfyUI-Foo"
+    assert result.project.dependencies == ["requests", "torch"]
+    assert result.tool_comfy.display_name == "ComfyUI-Foo"
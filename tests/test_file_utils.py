@@ -1,5 +1,11 @@
 import json
+import os
 import pathlib
+import subprocess
+import sys
+import types
+import zipfile
+import zlib
 from unittest.mock import Mock, patch
 
 import pytest
@@ -11,7 +17,9 @@ from comfy_cli.file_utils import (
     download_file,
     extract_package_as_zip,
     guess_status_code_reason,
+    list_git_tracked_files,
     upload_file_to_signed_url,
+    zip_files,
 )
 
 
@@ -43,33 +51,48 @@ def test_guess_status_code_reason_unknown():
     assert "Unknown error occurred (status code: 500)" in result
 
 
-@patch("requests.get")
-def test_check_unauthorized_true(mock_get):
+@patch("comfy_cli.file_utils._session.head")
+def test_check_unauthorized_true(mock_head):
     mock_response = Mock()
     mock_response.status_code = 401
-    mock_get.return_value = mock_response
+    mock_head.return_value = mock_response
 
     assert check_unauthorized("http://example.com") is True
 
 
-@patch("requests.get")
-def test_check_unauthorized_false(mock_get):
+@patch("comfy_cli.file_utils._session.head")
+def test_check_unauthorized_false(mock_head):
     mock_response = Mock()
     mock_response.status_code = 200
-    mock_get.return_value = mock_response
+    mock_head.return_value = mock_response
 
     assert check_unauthorized("http://example.com") is False
 
 
-@patch("requests.get")
-def test_check_unauthorized_exception(mock_get):
-    mock_get.side_effect = requests.RequestException()
+@patch("comfy_cli.file_utils._session.head")
+def test_check_unauthorized_exception(mock_head):
+    mock_head.side_effect = requests.RequestException()
 
     assert check_unauthorized("http://example.com") is False
 
 
-@patch("httpx.stream")
-def test_download_file_success(mock_stream, tmp_path):
+@patch("comfy_cli.file_utils._session.get")
+@patch("comfy_cli.file_utils._session.head")
+def test_check_unauthorized_head_not_allowed(mock_head, mock_get):
+    mock_head.return_value = Mock(status_code=405)
+    mock_response = Mock()
+    mock_response.status_code = 401
+    mock_response.__enter__ = Mock(return_value=mock_response)
+    mock_response.__exit__ = Mock(return_value=None)
+    mock_get.return_value = mock_response
+
+    assert check_unauthorized("http://example.com") is True
+    assert mock_get.call_args.kwargs["stream"] is True
+
+
+@patch("comfy_cli.file_utils._get_http_client")
+def test_download_file_success(mock_get_client, tmp_path):
+    mock_stream = mock_get_client.return_value.stream
     mock_response = Mock()
     mock_response.status_code = 200
     mock_response.headers = {"Content-Length": "1024"}
@@ -85,8 +108,117 @@ def test_download_file_success(mock_stream, tmp_path):
     assert test_file.read_bytes() == b"test data"
 
 
-@patch("httpx.stream")
-def test_download_file_failure(mock_stream):
+def _mock_stream_response(status_code, headers=None, body=b""):
+    response = Mock()
+    response.status_code = status_code
+    response.headers = headers or {}
+    response.iter_bytes.return_value = [body]
+    response.__enter__ = Mock(return_value=response)
+    response.__exit__ = Mock(return_value=None)
+    return response
+
+
+@patch("comfy_cli.file_utils._RANGED_DOWNLOAD_MIN_SIZE", 8)
+@patch("comfy_cli.file_utils._get_http_client")
+def test_download_file_ranged(mock_get_client, tmp_path):
+    mock_stream = mock_get_client.return_value.stream
+    content = b"0123456789abcdef"
+
+    def stream(method, url, follow_redirects, headers):
+        if "Range" not in headers:
+            return _mock_stream_response(200, {"Content-Length": str(len(content)), "Accept-Ranges": "bytes"})
+        start, end = map(int, headers["Range"][len("bytes=") :].split("-"))
+        return _mock_stream_response(206, body=content[start : end + 1])
+
+    mock_stream.side_effect = stream
+
+    test_file = tmp_path / "model.safetensors"
+    download_file("http://example.com", test_file, headers={"Authorization": "Bearer token"})
+
+    assert test_file.read_bytes() == content
+    probe_headers = mock_stream.call_args_list[0].kwargs["headers"]
+    assert probe_headers["Accept-Encoding"] == "identity"
+    range_headers = [c.kwargs["headers"] for c in mock_stream.call_args_list[1:]]
+    assert len(range_headers) == 4
+    assert all(h["Authorization"] == "Bearer token" for h in range_headers)
+    assert all(h["Accept-Encoding"] == "identity" for h in range_headers)
+
+
+@patch("comfy_cli.file_utils._RANGED_DOWNLOAD_MIN_SIZE", 8)
+@patch("comfy_cli.file_utils._get_http_client")
+def test_download_file_ranged_falls_back_to_serial(mock_get_client, tmp_path):
+    mock_stream = mock_get_client.return_value.stream
+    content = b"0123456789abcdef"
+    mock_stream.side_effect = lambda method, url, follow_redirects, headers: _mock_stream_response(
+        200, {"Content-Length": str(len(content)), "Accept-Ranges": "bytes"}, content
+    )
+
+    test_file = tmp_path / "model.safetensors"
+    download_file("http://example.com", test_file)
+
+    assert test_file.read_bytes() == content
+
+
+def _ranged_stream(content, failing_status):
+    """Mock stream() serving content in ranges, answering the range at offset 4 with failing_status."""
+
+    def stream(method, url, follow_redirects, headers):
+        headers = headers or {}
+        if "Range" not in headers:
+            return _mock_stream_response(200, {"Content-Length": str(len(content)), "Accept-Ranges": "bytes"}, content)
+        start, end = map(int, headers["Range"][len("bytes=") :].split("-"))
+        if start == 4:
+            return _mock_stream_response(failing_status)
+        return _mock_stream_response(206, body=content[start : end + 1])
+
+    return stream
+
+
+@patch("comfy_cli.file_utils._RANGED_DOWNLOAD_MIN_SIZE", 8)
+@patch("comfy_cli.file_utils._get_http_client")
+def test_download_file_throttled_range_falls_back_to_serial(mock_get_client, tmp_path):
+    mock_stream = mock_get_client.return_value.stream
+    content = b"0123456789abcdef"
+    mock_stream.side_effect = _ranged_stream(content, 429)
+
+    test_file = tmp_path / "model.safetensors"
+    download_file("http://example.com", test_file)
+
+    assert test_file.read_bytes() == content
+    assert mock_stream.call_args.kwargs["headers"] is None
+
+
+@patch("comfy_cli.file_utils._RANGED_DOWNLOAD_MIN_SIZE", 8)
+@patch("comfy_cli.file_utils._get_http_client")
+def test_download_file_failed_range_leaves_no_file(mock_get_client, tmp_path):
+    mock_get_client.return_value.stream.side_effect = _ranged_stream(b"0123456789abcdef", 500)
+
+    test_file = tmp_path / "model.safetensors"
+    with pytest.raises(DownloadException):
+        download_file("http://example.com", test_file)
+
+    assert not test_file.exists()
+
+
+@patch("comfy_cli.file_utils._RANGED_DOWNLOAD_MIN_SIZE", 8)
+@patch("comfy_cli.file_utils._get_http_client")
+def test_download_file_encoded_response_is_not_ranged(mock_get_client, tmp_path):
+    mock_stream = mock_get_client.return_value.stream
+    content = b"0123456789abcdef"
+    mock_stream.return_value = _mock_stream_response(
+        200, {"Content-Length": "12", "Accept-Ranges": "bytes", "Content-Encoding": "gzip"}, content
+    )
+
+    test_file = tmp_path / "model.safetensors"
+    download_file("http://example.com", test_file)
+
+    assert test_file.read_bytes() == content
+    assert mock_stream.call_count == 1
+
+
+@patch("comfy_cli.file_utils._get_http_client")
+def test_download_file_failure(mock_get_client):
+    mock_stream = mock_get_client.return_value.stream
     mock_response = Mock()
     mock_response.status_code = 404
     mock_response.read.return_value = ""
@@ -100,7 +232,22 @@ def test_download_file_failure(mock_stream):
     assert "Failed to download file" in str(exc_info.value)
 
 
-@patch("requests.put")
+@patch("comfy_cli.file_utils.shutil.disk_usage", return_value=Mock(free=512))
+@patch("comfy_cli.file_utils._get_http_client")
+def test_download_file_not_enough_disk_space(mock_get_client, mock_disk_usage, tmp_path):
+    mock_get_client.return_value.stream.return_value = _mock_stream_response(
+        200, {"Content-Length": "1024"}, b"x" * 1024
+    )
+
+    test_file = tmp_path / "model.safetensors"
+    with pytest.raises(DownloadException) as exc_info:
+        download_file("http://example.com", test_file)
+
+    assert "Not enough disk space" in str(exc_info.value)
+    assert not test_file.exists()
+
+
+@patch("comfy_cli.file_utils._session.put")
 def test_upload_file_success(mock_put, tmp_path):
     test_file = tmp_path / "test.zip"
     test_file.write_bytes(b"test data")
@@ -114,7 +261,7 @@ def test_upload_file_success(mock_put, tmp_path):
     mock_put.assert_called_once()
 
 
-@patch("requests.put")
+@patch("comfy_cli.file_utils._session.put")
 def test_upload_file_failure(mock_put, tmp_path):
     test_file = tmp_path / "test.zip"
     test_file.write_bytes(b"test data")
@@ -132,8 +279,6 @@ def test_upload_file_failure(mock_put, tmp_path):
 
 def test_extract_package_as_zip(tmp_path):
     # Create a test zip file
-    import zipfile
-
     zip_path = tmp_path / "test.zip"
     extract_path = tmp_path / "extracted"
 
@@ -144,3 +289,158 @@ def test_extract_package_as_zip(tmp_path):
 
     assert (extract_path / "test.txt").exists()
     assert (extract_path / "test.txt").read_text() == "test content"
+
+
+def test_zip_files_skips_compression_for_compressed_assets(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / "node.py").write_text("print('hello')\n" * 100)
+    (tmp_path / "model.safetensors").write_bytes(b"\x00" * 1024)
+
+    zip_files("node.zip")
+
+    with zipfile.ZipFile(tmp_path / "node.zip") as zipf:
+        infos = {info.filename: info for info in zipf.infolist()}
+
+    assert "node.zip" not in infos
+    assert infos["node.py"].compress_type == zipfile.ZIP_DEFLATED
+    assert infos["model.safetensors"].compress_type == zipfile.ZIP_STORED
+
+
+def test_zip_files_with_libdeflate(tmp_path, monkeypatch):
+    compressed = []
+
+    def deflate_compress(data, level):
+        # raw deflate stream, as libdeflate produces
+        compressor = zlib.compressobj(level, zlib.DEFLATED, -15)
+        compressed.append(data)
+        return compressor.compress(data) + compressor.flush()
+
+    monkeypatch.setattr("comfy_cli.file_utils.deflate", types.SimpleNamespace(deflate_compress=deflate_compress))
+    monkeypatch.chdir(tmp_path)
+    content = b"print('hello')\n" * 100
+    (tmp_path / "node.py").write_bytes(content)
+
+    zip_files("node.zip")
+
+    assert compressed == [content]
+    with zipfile.ZipFile(tmp_path / "node.zip") as zipf:
+        assert zipf.testzip() is None
+        assert zipf.getinfo("node.py").compress_type == zipfile.ZIP_DEFLATED
+        assert zipf.read("node.py") == content
+
+
+def test_zip_files_accepts_pre_1980_timestamps(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    old_file = tmp_path / "old.py"
+    old_file.write_text("print('old')\n")
+    os.utime(old_file, (0, 0))
+
+    zip_files("node.zip")
+
+    with zipfile.ZipFile(tmp_path / "node.zip") as zipf:
+        assert zipf.read("old.py") == b"print('old')\n"
+        assert zipf.getinfo("old.py").date_time[0] == 1980
+
+
+def test_list_git_tracked_files_matches_ls_files(tmp_path):
+    pytest.importorskip("pygit2")
+
+    subprocess.run(["git", "init", "-q", str(tmp_path)], check=True)
+    (tmp_path / "sub").mkdir()
+    (tmp_path / "top.py").write_text("")
+    (tmp_path / "sub" / "node file.py").write_text("")
+    (tmp_path / "untracked.py").write_text("")
+    subprocess.run(["git", "-C", str(tmp_path), "add", "top.py", "sub"], check=True)
+
+    assert sorted(list_git_tracked_files(str(tmp_path))) == ["sub/node file.py", "top.py"]
+    assert list(list_git_tracked_files(str(tmp_path / "sub"))) == ["node file.py"]
+
+
+def _fake_pygit2(workdir, index_paths, bare=False):
+    """Minimal pygit2 stand-in: a repository at workdir whose index holds index_paths."""
+    pygit2 = types.ModuleType("pygit2")
+    git_dir = os.path.join(workdir, ".git")
+
+    def discover_repository(path):
+        path = os.path.realpath(path)
+        root = os.path.realpath(workdir)
+        return git_dir if path == root or path.startswith(root + os.sep) else None
+
+    def Repository(path):
+        assert path == git_dir
+        return types.SimpleNamespace(
+            is_bare=bare,
+            workdir=None if bare else os.path.join(workdir, ""),
+            index=[types.SimpleNamespace(path=p) for p in index_paths],
+        )
+
+    pygit2.discover_repository = discover_repository
+    pygit2.Repository = Repository
+    return pygit2
+
+
+def test_list_git_tracked_files_reads_index_in_process(tmp_path, monkeypatch):
+    repo = tmp_path / "repo"
+    (repo / "sub").mkdir(parents=True)
+    index_paths = ["top.py", "sub/node file.py", "sub/deep/mod.py", "subdir/other.py"]
+    monkeypatch.setitem(sys.modules, "pygit2", _fake_pygit2(str(repo), index_paths))
+
+    with patch("comfy_cli.file_utils.subprocess.check_output") as mock_check_output:
+        assert list_git_tracked_files(str(repo)) == index_paths
+        # paths come back relative to the subdirectory, and "subdir/" isn't under "sub/"
+        assert list_git_tracked_files(str(repo / "sub")) == ["node file.py", "deep/mod.py"]
+    mock_check_output.assert_not_called()
+
+
+@pytest.mark.parametrize("in_repo, bare", [(False, False), (True, True)], ids=["outside-work-tree", "bare"])
+def test_list_git_tracked_files_falls_back_to_ls_files(in_repo, bare, tmp_path, monkeypatch):
+    workdir = tmp_path if in_repo else tmp_path / "elsewhere"
+    monkeypatch.setitem(sys.modules, "pygit2", _fake_pygit2(str(workdir), ["ignored.py"], bare=bare))
+
+    with patch(
+        "comfy_cli.file_utils.subprocess.check_output", return_value=b"a.py\x00sub/b c.py\x00"
+    ) as mock_check_output:
+        assert list(list_git_tracked_files(str(tmp_path))) == ["a.py", "sub/b c.py"]
+    mock_check_output.assert_called_once_with(["git", "-C", str(tmp_path), "ls-files", "-z"])
+
+
+def test_zip_files_walk_fallback_nested(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / "pkg" / "sub").mkdir(parents=True)
+    (tmp_path / "pkg" / "sub" / "mod.py").write_text("x = 1\n")
+    (tmp_path / ".git").mkdir()
+    (tmp_path / ".git" / "HEAD").write_text("ref: refs/heads/main\n")
+    (tmp_path / "dist").mkdir()
+
+    zip_files("dist/node.zip")
+
+    with zipfile.ZipFile(tmp_path / "dist" / "node.zip") as zipf:
+        assert zipf.namelist() == ["pkg/sub/mod.py"]
+
+
+@patch("comfy_cli.file_utils._PARALLEL_DEFLATE_MAX_FILE_SIZE", 4096)
+@patch("comfy_cli.file_utils._PARALLEL_ZIP_MIN_SIZE", 0)
+def test_zip_files_thread_pool(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    expected = {}
+    for i in range(20):
+        # deflated on the pool
+        expected[f"src/mod{i}.py"] = f"value = {i}\n".encode() * (i + 1)
+    # stored as is, being already compressed
+    expected["weights.safetensors"] = os.urandom(2048)
+    # above _PARALLEL_DEFLATE_MAX_FILE_SIZE, so streamed in with ZipFile.write
+    expected["data/large.txt"] = b"0123456789abcdef" * 1024
+    for name, data in expected.items():
+        (tmp_path / name).parent.mkdir(parents=True, exist_ok=True)
+        (tmp_path / name).write_bytes(data)
+
+    zip_files("node.zip")
+
+    with zipfile.ZipFile(tmp_path / "node.zip") as zipf:
+        assert zipf.testzip() is None
+        assert sorted(zipf.namelist()) == sorted(expected)
+        for name, data in expected.items():
+            assert zipf.read(name) == data
+        assert zipf.getinfo("src/mod0.py").compress_type == zipfile.ZIP_DEFLATED
+        assert zipf.getinfo("weights.safetensors").compress_type == zipfile.ZIP_STORED
+        assert zipf.getinfo("data/large.txt").compress_type == zipfile.ZIP_DEFLATED
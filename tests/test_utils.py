@@ -0,0 +1,120 @@
+import gzip
+import io
+import os
+import shutil
+import sys
+import tarfile
+import types
+from unittest.mock import patch
+
+import pytest
+
+from comfy_cli.utils import create_tarball, extract_tarball
+
+
+def _tree(root):
+    """
+    Map each path under root to ("link", target) for symlinks, ("dir",) for directories
+    and ("file", permission bits, contents) for files. Hard links aren't distinguished.
+    """
+    tree = {}
+    for dirpath, dirnames, filenames in os.walk(root):
+        for name in dirnames + filenames:
+            path = os.path.join(dirpath, name)
+            rel_path = os.path.relpath(path, root)
+            if os.path.islink(path):
+                tree[rel_path] = ("link", os.readlink(path))
+            elif os.path.isdir(path):
+                tree[rel_path] = ("dir",)
+            else:
+                with open(path, "rb") as f:
+                    tree[rel_path] = ("file", os.stat(path).st_mode & 0o777, f.read())
+    return tree
+
+
+def _use_pigz(monkeypatch, tmp_path):
+    """Put pigz on PATH, falling back to a gzip-backed stand-in for it."""
+    if shutil.which("pigz") is not None:
+        return
+    if sys.platform == "win32" or shutil.which("gzip") is None:
+        pytest.skip("requires pigz or gzip")
+    bin_dir = tmp_path / "bin"
+    bin_dir.mkdir()
+    pigz = bin_dir / "pigz"
+    pigz.write_text("#!/bin/sh\nexec gzip -9 -c\n")
+    pigz.chmod(0o755)
+    monkeypatch.setenv("PATH", f"{bin_dir}{os.pathsep}{os.environ['PATH']}")
+
+
+def _use_rapidgzip(monkeypatch):
+    """Replace rapidgzip with a gzip.open-backed stand-in; returns the list of its open() calls."""
+    calls = []
+
+    def open_(filename, parallelization=0):
+        calls.append((filename, parallelization))
+        return gzip.open(filename, "rb")
+
+    monkeypatch.setattr("comfy_cli.utils.rapidgzip", types.SimpleNamespace(open=open_))
+    return calls
+
+
+@pytest.mark.skipif(sys.platform == "win32", reason="uses symlinks and hard links")
+@pytest.mark.parametrize("backend", ["tarfile-gzip", "pigz", "rapidgzip"])
+@patch("comfy_cli.utils._PARALLEL_EXTRACT_MAX_FILE_SIZE", 1024)
+def test_tarball_round_trip(backend, tmp_path, monkeypatch):
+    rapidgzip_calls = None
+    if backend == "pigz":
+        _use_pigz(monkeypatch, tmp_path)
+    else:
+        monkeypatch.setattr("comfy_cli.utils.shutil.which", lambda name: None)
+    if backend == "rapidgzip":
+        rapidgzip_calls = _use_rapidgzip(monkeypatch)
+    else:
+        monkeypatch.setattr("comfy_cli.utils.rapidgzip", None)
+
+    src = tmp_path / "src" / "python"
+    (src / "bin").mkdir(parents=True)
+    (src / "lib" / "empty").mkdir(parents=True)
+    for i in range(50):
+        (src / "lib" / f"mod{i}.py").write_text(f"value = {i}\n" * (i + 1))
+    # above _PARALLEL_EXTRACT_MAX_FILE_SIZE, so streamed to disk by tarfile
+    (src / "lib" / "big.bin").write_bytes(os.urandom(64 * 1024))
+    (src / "bin" / "python3.12").write_bytes(b"#!python\n")
+    (src / "bin" / "python3.12").chmod(0o755)
+    os.symlink("python3.12", src / "bin" / "python3")
+    os.link(src / "bin" / "python3.12", src / "bin" / "python3.12-hard")
+
+    out = tmp_path / "out"
+    out.mkdir()
+    monkeypatch.chdir(src.parent)
+    create_tarball(src, out / "python.tgz", cwd=src.parent)
+
+    with tarfile.open(out / "python.tgz") as tar:
+        assert tar.getmember("python/bin/python3.12-hard").islnk()
+
+    monkeypatch.chdir(out)
+    extract_tarball(out / "python.tgz", out / "extracted")
+
+    extracted = out / "extracted"
+    assert _tree(extracted) == _tree(src)
+    if rapidgzip_calls is not None:
+        assert len(rapidgzip_calls) == 1
+        assert rapidgzip_calls[0][1] >= 1
+    assert os.stat(extracted / "bin" / "python3.12-hard").st_ino == os.stat(extracted / "bin" / "python3.12").st_ino
+
+
+@patch("comfy_cli.utils._PARALLEL_EXTRACT_MAX_FILE_SIZE", 1024)
+def test_extract_tarball_keeps_last_duplicate_member(tmp_path, monkeypatch):
+    tarball = tmp_path / "dup.tgz"
+    with tarfile.open(tarball, "w:gz") as tar:
+        for i in range(200):
+            # every tenth copy is big enough to be streamed inline instead of pooled
+            data = (f"copy {i}\n" * (200 if i % 10 == 9 else 1)).encode()
+            info = tarfile.TarInfo("top/dup.txt")
+            info.size = len(data)
+            tar.addfile(info, io.BytesIO(data))
+
+    monkeypatch.chdir(tmp_path)
+    extract_tarball(tarball, tmp_path / "extracted")
+
+    assert (tmp_path / "extracted" / "dup.txt").read_text() == "copy 199\n" * 200